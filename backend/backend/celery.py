@@ -8,9 +8,17 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings.local")
 celery_app = Celery("backend")
 celery_app.config_from_object("django.conf:settings", namespace="CELERY")
 
+# Connects the queue-wait and run-time signal handlers.
+import core.utils.celery_metrics  # noqa: E402,F401
+
 celery_app.autodiscover_tasks([
     'shared_apps.custom_auth.tasks.email_tasks',
     'shared_apps.tenants.tasks.email_tasks',
+    'shared_apps.tenants.tasks.retention_tasks',
+    'shared_apps.mailer.tasks.outbox_tasks',
     'tenant_apps.employee.tasks.email_tasks',
     'tenant_apps.project_management.tasks.email_tasks',
+    'tenant_apps.project_management.tasks.audit_tasks',
+    'tenant_apps.communication.tasks.chat_tasks',
+    'tenant_apps.notifications.tasks.notification_tasks',
 ])
\ No newline at end of file
@@ -2,6 +2,8 @@ import os
 import environ
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
+from kombu import Queue
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 env = environ.Env()
@@ -20,6 +22,7 @@ SHARED_APPS = [
     'shared_apps.tenants',
     'shared_apps.custom_auth',
     'shared_apps.billing',
+    'shared_apps.mailer',
 
     'rest_framework',
     'django_filters',
@@ -69,6 +72,134 @@ CELERY_BROKER_URL = "redis://redis:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# Queue topology: each lane has its own workers (see docker-compose.yml) so a
+# burst on one cannot starve another.
+#   realtime  notifications and chat write-behind; short tasks, latency matters
+#   email     outbox dispatch and email tasks; few workers, rate limited per
+#             tenant by the outbox (EMAIL_TENANT_RATE_LIMIT)
+#   bulk      retention, archiving, digests, imports and exports
+#   default   everything else
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_QUEUES = (
+    Queue("default"),
+    Queue("realtime"),
+    Queue("email"),
+    Queue("bulk"),
+)
+# First match wins, so specific names come before globs.
+CELERY_TASK_ROUTES = {
+    "tenant_apps.notifications.tasks.notification_tasks.send_notification_digests_task": {"queue": "bulk"},
+    "tenant_apps.notifications.tasks.*": {"queue": "realtime"},
+    "tenant_apps.communication.tasks.chat_tasks.flush_chat_write_behind_task": {"queue": "realtime"},
+    "tenant_apps.communication.tasks.chat_tasks.archive_chat_messages_task": {"queue": "bulk"},
+    "shared_apps.mailer.tasks.outbox_tasks.purge_email_outbox_task": {"queue": "bulk"},
+    "shared_apps.mailer.tasks.outbox_tasks.*": {"queue": "email"},
+    "*.email_tasks.*": {"queue": "email"},
+    "shared_apps.tenants.tasks.retention_tasks.*": {"queue": "bulk"},
+    "*.import_tasks.*": {"queue": "bulk"},
+    "*.export_tasks.*": {"queue": "bulk"},
+}
+
+# Audit sink: "sync" (in the request transaction), "commit" (one bulk insert after commit)
+# or "async" (one bulk insert on a Celery worker after commit, keeping it off the request).
+AUDIT_SINK_DURABILITY = env("AUDIT_SINK_DURABILITY", default="async")
+
+CELERY_BEAT_SCHEDULE = {
+    "flush-chat-write-behind": {
+        "task": "tenant_apps.communication.tasks.chat_tasks.flush_chat_write_behind_task",
+        "schedule": 2.0,
+    },
+    "archive-chat-messages": {
+        "task": "tenant_apps.communication.tasks.chat_tasks.archive_chat_messages_task",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "send-notification-digests": {
+        "task": "tenant_apps.notifications.tasks.notification_tasks.send_notification_digests_task",
+        "schedule": crontab(minute=0),
+    },
+    "run-retention": {
+        "task": "shared_apps.tenants.tasks.retention_tasks.run_retention_task",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "dispatch-email-outbox": {
+        "task": "shared_apps.mailer.tasks.outbox_tasks.dispatch_email_outbox_task",
+        "schedule": 10.0,
+    },
+    "purge-email-outbox": {
+        "task": "shared_apps.mailer.tasks.outbox_tasks.purge_email_outbox_task",
+        "schedule": crontab(hour=4, minute=30),
+    },
+}
+
+# Chat write-behind: broadcast first, persist in batches from a Redis Stream.
+CHAT_WRITE_BEHIND = env.bool("CHAT_WRITE_BEHIND", default=False)
+CHAT_WRITE_BEHIND_BATCH_SIZE = env.int("CHAT_WRITE_BEHIND_BATCH_SIZE", default=500)
+CHAT_WRITE_BEHIND_RETRY_AFTER_MS = env.int("CHAT_WRITE_BEHIND_RETRY_AFTER_MS", default=30000)
+CHAT_WRITE_BEHIND_MAX_DELIVERIES = env.int("CHAT_WRITE_BEHIND_MAX_DELIVERIES", default=5)
+
+# Presence: a socket counts as online for PRESENCE_TTL seconds after its last heartbeat.
+PRESENCE_TTL = env.int("PRESENCE_TTL", default=60)
+PRESENCE_HEARTBEAT_INTERVAL = env.int("PRESENCE_HEARTBEAT_INTERVAL", default=20)
+
+# Chat archive: messages older than this move to compressed MessageArchiveChunk rows.
+CHAT_ARCHIVE_AFTER_DAYS = env.int("CHAT_ARCHIVE_AFTER_DAYS", default=180)
+CHAT_ARCHIVE_BATCH_SIZE = env.int("CHAT_ARCHIVE_BATCH_SIZE", default=2000)
+
+# Seconds a room's cached participant set lives in Redis; changes invalidate it earlier.
+CHAT_MEMBERSHIP_CACHE_TTL = env.int("CHAT_MEMBERSHIP_CACHE_TTL", default=3600)
+
+# Channel layer tuning, shared by every environment's CHANNEL_LAYERS.
+# capacity bounds each socket's inbox; a busy project room needs headroom so
+# group_send does not drop messages for slow readers.
+CHANNEL_LAYER_CAPACITY = env.int("CHANNEL_LAYER_CAPACITY", default=500)
+CHANNEL_LAYER_EXPIRY = env.int("CHANNEL_LAYER_EXPIRY", default=30)
+CHANNEL_LAYER_GROUP_EXPIRY = env.int("CHANNEL_LAYER_GROUP_EXPIRY", default=86400)
+# Send chat events as positional msgpack arrays instead of keyed dicts.
+CHAT_COMPACT_EVENTS = env.bool("CHAT_COMPACT_EVENTS", default=False)
+
+# Seconds a user's cached unread notification count lives in Redis before it is recounted.
+NOTIFICATION_UNREAD_CACHE_TTL = env.int("NOTIFICATION_UNREAD_CACHE_TTL", default=86400)
+# Seconds that coalesced notification kinds for one (recipient, kind, target) are
+# gathered into a single notification; 0 (the default) sends each one straight away.
+NOTIFICATION_COALESCE_WINDOW = env.int("NOTIFICATION_COALESCE_WINDOW", default=0)
+# Low-priority kinds held back for the hourly digest instead of being pushed.
+NOTIFICATION_DIGEST_KINDS = env.list("NOTIFICATION_DIGEST_KINDS", default=[])
+
+# Retention: expired rows in high-volume tenant tables, purged nightly in small
+# batches (see shared_apps/tenants/retention.py for the policy format).
+RETENTION_POLICIES = [
+    {
+        "model": "notifications.Notification",
+        "field": "created_at",
+        "days": env.int("RETENTION_READ_NOTIFICATION_DAYS", default=90),
+        "filter": {"is_read": True},
+    },
+    {
+        "model": "notifications.Notification",
+        "field": "created_at",
+        "days": env.int("RETENTION_NOTIFICATION_DAYS", default=365),
+        "hook": "tenant_apps.notifications.utils.unread_counter.forget_purged",
+    },
+    {
+        "model": "project_management.SubtaskAssignmentAudit",
+        "field": "timestamp",
+        "days": env.int("RETENTION_AUDIT_DAYS", default=730),
+        "action": "archive",
+    },
+    {
+        "model": "project_management.DeveloperAssignmentAuditLog",
+        "field": "assigned_at",
+        "days": env.int("RETENTION_AUDIT_DAYS", default=730),
+        "action": "archive",
+    },
+]
+RETENTION_BATCH_SIZE = env.int("RETENTION_BATCH_SIZE", default=1000)
+RETENTION_LOCK_TIMEOUT_MS = env.int("RETENTION_LOCK_TIMEOUT_MS", default=2000)
+RETENTION_STATEMENT_TIMEOUT_MS = env.int("RETENTION_STATEMENT_TIMEOUT_MS", default=30000)
+# Share of wall-clock time the purge may keep the database busy; it sleeps the rest.
+RETENTION_MAX_DUTY_CYCLE = env.float("RETENTION_MAX_DUTY_CYCLE", default=0.25)
+RETENTION_TIME_BUDGET = env.int("RETENTION_TIME_BUDGET", default=900)
+
 TENANT_MODEL = "tenants.Client"
 TENANT_DOMAIN_MODEL = "tenants.Domain"
 DEFAULT_TENANT_DOMAIN = env("DEFAULT_TENANT_DOMAIN")
@@ -164,6 +295,22 @@ EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS")
 EMAIL_HOST_USER = env("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+# Pooled dispatch (shared_apps/mailer/dispatch.py): per-message retries with
+# exponential backoff, and how long an idle SMTP connection is kept open.
+EMAIL_SEND_ATTEMPTS = env.int("EMAIL_SEND_ATTEMPTS", default=3)
+EMAIL_RETRY_BACKOFF = env.float("EMAIL_RETRY_BACKOFF", default=1.0)
+EMAIL_CONNECTION_MAX_IDLE = env.int("EMAIL_CONNECTION_MAX_IDLE", default=30)
+# Email outbox (shared_apps/mailer/outbox.py).
+EMAIL_OUTBOX_BATCH_SIZE = env.int("EMAIL_OUTBOX_BATCH_SIZE", default=50)
+EMAIL_OUTBOX_TIME_BUDGET = env.int("EMAIL_OUTBOX_TIME_BUDGET", default=30)
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int("EMAIL_OUTBOX_MAX_ATTEMPTS", default=5)
+EMAIL_OUTBOX_RETRY_BACKOFF = env.int("EMAIL_OUTBOX_RETRY_BACKOFF", default=60)
+# Seconds a claimed row is hidden from other dispatchers; a crashed dispatcher's rows come back after it.
+EMAIL_OUTBOX_LEASE = env.int("EMAIL_OUTBOX_LEASE", default=300)
+EMAIL_OUTBOX_KEEP_DAYS = env.int("EMAIL_OUTBOX_KEEP_DAYS", default=7)
+# Emails per minute per tenant; the public schema (signup, OTP, workspace lookup) has its own budget.
+EMAIL_TENANT_RATE_LIMIT = env.int("EMAIL_TENANT_RATE_LIMIT", default=60)
+EMAIL_PUBLIC_RATE_LIMIT = env.int("EMAIL_PUBLIC_RATE_LIMIT", default=300)
 
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
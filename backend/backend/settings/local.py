@@ -83,6 +83,10 @@ CHANNEL_LAYERS = {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
         'CONFIG': {
             "hosts": [REDIS_URL],
+            "capacity": CHANNEL_LAYER_CAPACITY,
+            "expiry": CHANNEL_LAYER_EXPIRY,
+            "group_expiry": CHANNEL_LAYER_GROUP_EXPIRY,
+            "serializer_format": "msgpack",
         },
     },
 }
\ No newline at end of file
@@ -30,4 +30,12 @@ class TaskStatus(models.TextChoices):
 class Priority(models.TextChoices):
     LOW = 'low', 'Low'
     MEDIUM = 'medium', 'Medium'
-    HIGH = 'high', 'High'
\ No newline at end of file
+    HIGH = 'high', 'High'
+
+
+class NotificationKind(models.TextChoices):
+    GENERAL = 'general', 'General'
+    SUBTASK_ASSIGNED = 'subtask_assigned', 'Subtask Assigned'
+    SUBTASK_UNASSIGNED = 'subtask_unassigned', 'Subtask Unassigned'
+    BLOCKING_SUBTASKS = 'blocking_subtasks', 'Blocking Subtasks'
+    DIGEST = 'digest', 'Digest'
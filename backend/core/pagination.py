@@ -1,3 +1,7 @@
+import base64
+from datetime import datetime
+
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import LimitOffsetPagination
 
 class StandardLimitOffsetPagination(LimitOffsetPagination):
@@ -7,4 +11,20 @@ class StandardLimitOffsetPagination(LimitOffsetPagination):
 
 class StandardAuditPagination(LimitOffsetPagination):
     default_limit = 10
-    max_limit = 50
\ No newline at end of file
+    max_limit = 50
+
+
+def encode_keyset_cursor(timestamp, pk):
+    """
+    Opaque cursor for (timestamp, id) keyset pagination.
+    """
+    raw = f"{timestamp.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_keyset_cursor(cursor):
+    try:
+        timestamp, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({"detail": "Invalid cursor."})
@@ -0,0 +1,81 @@
+# core/utils/celery_metrics.py
+
+"""
+Per-queue Celery metrics.
+
+Every published task carries its publish time in a header. Workers record
+how long it waited in its queue under celery.wait.<queue> and how long it ran
+under celery.run.<queue>, through record_timing. queue_depths() reads the
+backlog of each declared queue straight from the Redis broker.
+
+Settings are only read inside the handlers: this module is imported by
+backend/celery.py, before Django is configured.
+"""
+
+import time
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+
+PUBLISHED_AT_HEADER = "published_at"
+# kombu's Redis transport keeps one list per priority step: "<queue>", "<queue>\x06\x163", ...
+PRIORITY_SEPARATOR = "\x06\x16"
+PRIORITY_STEPS = (0, 3, 6, 9)
+
+_started = {}
+
+
+@before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def record_queue_wait(task_id=None, task=None, **kwargs):
+    _started[task_id] = time.monotonic()
+    published_at = task.request.get(PUBLISHED_AT_HEADER)
+    if published_at is None or task.request.is_eager:
+        return
+
+    from core.utils.metrics import record_timing
+
+    record_timing(f"celery.wait.{_queue_of(task)}", max(time.time() - float(published_at), 0))
+
+
+@task_postrun.connect
+def record_run_time(task_id=None, task=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is None or task.request.is_eager:
+        return
+
+    from core.utils.metrics import record_timing
+
+    record_timing(f"celery.run.{_queue_of(task)}", time.monotonic() - started)
+
+
+def _queue_of(task):
+    delivery_info = task.request.delivery_info or {}
+    return delivery_info.get("routing_key") or "unknown"
+
+
+def queue_depths():
+    """
+    Returns {queue: messages waiting} for every queue in CELERY_TASK_QUEUES.
+    """
+    import redis
+    from django.conf import settings
+
+    client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+    names = [queue.name for queue in settings.CELERY_TASK_QUEUES]
+
+    pipe = client.pipeline(transaction=False)
+    for name in names:
+        for step in PRIORITY_STEPS:
+            pipe.llen(f"{name}{PRIORITY_SEPARATOR}{step}" if step else name)
+    lengths = pipe.execute()
+
+    per_queue = len(PRIORITY_STEPS)
+    return {
+        name: sum(lengths[i * per_queue:(i + 1) * per_queue])
+        for i, name in enumerate(names)
+    }
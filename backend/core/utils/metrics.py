@@ -0,0 +1,76 @@
+# core/utils/metrics.py
+
+import logging
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL)
+
+METRICS_KEY = "metrics:timings"
+METRIC_PREFIX = "metrics:timing:"
+COUNTERS_KEY = "metrics:counters"
+
+# Keeps max_ms monotonic without a read-modify-write race between workers.
+_RECORD_TIMING = redis_client.register_script("""
+redis.call('HINCRBY', KEYS[1], 'count', 1)
+redis.call('HINCRBYFLOAT', KEYS[1], 'total_ms', ARGV[1])
+redis.call('HSET', KEYS[1], 'last_ms', ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'max_ms') or '0')
+if tonumber(ARGV[1]) > current then
+    redis.call('HSET', KEYS[1], 'max_ms', ARGV[1])
+end
+redis.call('SADD', KEYS[2], ARGV[2])
+""")
+
+
+def record_timing(name, seconds):
+    """
+    Records one duration sample under `name`. Never raises: metrics must not break callers.
+    """
+    try:
+        _RECORD_TIMING(keys=[f"{METRIC_PREFIX}{name}", METRICS_KEY], args=[round(seconds * 1000, 3), name])
+    except redis.RedisError:
+        logger.warning(f"Could not record timing for {name}", exc_info=True)
+
+
+def record_count(name, n=1):
+    """
+    Adds `n` to the counter `name`. Never raises, like record_timing.
+    """
+    try:
+        redis_client.hincrby(COUNTERS_KEY, name, n)
+    except redis.RedisError:
+        logger.warning(f"Could not record count for {name}", exc_info=True)
+
+
+def get_counts():
+    """
+    Returns {name: total} for every counter.
+    """
+    return {k.decode(): int(v) for k, v in sorted(redis_client.hgetall(COUNTERS_KEY).items())}
+
+
+def get_timings():
+    """
+    Returns {name: {count, avg_ms, last_ms, max_ms}} for every recorded timing.
+    """
+    names = sorted(n.decode() for n in redis_client.smembers(METRICS_KEY))
+
+    pipe = redis_client.pipeline()
+    for name in names:
+        pipe.hgetall(f"{METRIC_PREFIX}{name}")
+
+    timings = {}
+    for name, raw in zip(names, pipe.execute()):
+        values = {k.decode(): float(v) for k, v in raw.items()}
+        count = int(values.get("count", 0))
+        timings[name] = {
+            "count": count,
+            "avg_ms": round(values.get("total_ms", 0) / count, 3) if count else 0,
+            "last_ms": values.get("last_ms", 0),
+            "max_ms": values.get("max_ms", 0),
+        }
+    return timings
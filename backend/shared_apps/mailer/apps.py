@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class MailerConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'shared_apps.mailer'
+
+    def ready(self):
+        import shared_apps.mailer.rendering
@@ -0,0 +1,110 @@
+"""
+Pooled email dispatch.
+
+send_mail opens a new SMTP connection, and a TLS handshake, for every message.
+This module keeps one connection open per worker thread and sends every
+message the worker handles over it, so a burst of email tasks costs one
+handshake. The connection is dropped after EMAIL_CONNECTION_MAX_IDLE idle
+seconds, after any connection-level error and when the worker process exits.
+
+Each message is retried on its own, up to EMAIL_SEND_ATTEMPTS times with
+exponential backoff starting at EMAIL_RETRY_BACKOFF seconds. Permanent
+rejections (5xx replies, refused recipients) are not retried.
+"""
+
+import logging
+import smtplib
+import threading
+import time
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def get_pooled_connection():
+    connection = getattr(_local, "connection", None)
+    if connection is not None and time.monotonic() - _local.last_used > settings.EMAIL_CONNECTION_MAX_IDLE:
+        # Servers hang up on idle sessions; reopening beats failing the next send.
+        close_pooled_connection()
+        connection = None
+
+    if connection is None:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        _local.connection = connection
+    _local.last_used = time.monotonic()
+    return connection
+
+
+def close_pooled_connection():
+    connection = getattr(_local, "connection", None)
+    _local.connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Closing pooled email connection failed", exc_info=True)
+
+
+@worker_process_shutdown.connect
+def close_on_worker_shutdown(**kwargs):
+    close_pooled_connection()
+
+
+def build_message(subject, message, recipient_list, html_message=None, from_email=None):
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=recipient_list,
+    )
+    if html_message:
+        email.attach_alternative(html_message, "text/html")
+    return email
+
+
+def is_permanent(error):
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+def send_messages(messages, attempts=None):
+    """
+    Sends every message over the pooled connection. Returns [(message, error)]
+    for the ones that still failed after retries.
+    """
+    attempts = attempts or settings.EMAIL_SEND_ATTEMPTS
+    failed = []
+    for message in messages:
+        for attempt in range(1, attempts + 1):
+            try:
+                get_pooled_connection().send_messages([message])
+                break
+            except Exception as error:
+                if not isinstance(error, smtplib.SMTPResponseException):
+                    # Disconnects and socket errors leave the session unusable.
+                    close_pooled_connection()
+                if is_permanent(error) or attempt == attempts:
+                    logger.error(f"Email to {message.to} failed after {attempt} attempt(s): {error}")
+                    failed.append((message, error))
+                    break
+                delay = settings.EMAIL_RETRY_BACKOFF * 2 ** (attempt - 1)
+                logger.warning(f"Email to {message.to} failed ({error}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+    return failed
+
+
+def send_email(subject, message, recipient_list, html_message=None, from_email=None):
+    """
+    Pooled replacement for send_mail(..., fail_silently=False): raises the last
+    error if the message could not be sent.
+    """
+    failed = send_messages([build_message(subject, message, recipient_list, html_message, from_email)])
+    if failed:
+        raise failed[0][1]
@@ -0,0 +1,101 @@
+"""
+Email dispatch benchmark against a local SMTP stand-in.
+
+Starts an in-process aiosmtpd server, then sends the same messages once with
+send_mail per message and once through the pooled dispatcher. Reports wall
+time, SMTP sessions opened and messages delivered for each. With
+--transient-failures the server answers 451 to every Nth delivery, which
+exercises the per-message retry path. The assertions for the same paths live
+in shared_apps/mailer/tests.py.
+
+    python manage.py bench_email_dispatch --messages 200 --transient-failures 10
+"""
+
+import logging
+import time
+
+from aiosmtpd.controller import Controller
+from django.core.mail import send_mail
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from shared_apps.mailer import dispatch
+
+
+class CountingHandler:
+    def __init__(self, fail_every=0):
+        self.fail_every = fail_every
+        self.attempts = 0
+        self.delivered = 0
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.attempts += 1
+        if self.fail_every and self.attempts % self.fail_every == 0:
+            return "451 Try again later"
+        self.delivered += 1
+        return "250 OK"
+
+
+class Command(BaseCommand):
+    help = "Compares send_mail per message with pooled dispatch against a local SMTP server."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=100, help="Messages per run.")
+        parser.add_argument("--port", type=int, default=8025, help="Port for the local SMTP server.")
+        parser.add_argument(
+            "--transient-failures", type=int, default=0, help="Answer 451 to every Nth delivery (0 disables)."
+        )
+
+    def handle(self, *args, **options):
+        # aiosmtpd logs every SMTP command at INFO.
+        logging.getLogger("mail.log").setLevel(logging.WARNING)
+
+        smtp_settings = {
+            "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": options["port"],
+            "EMAIL_USE_TLS": False,
+            "EMAIL_USE_SSL": False,
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",
+            "EMAIL_RETRY_BACKOFF": 0.01,
+        }
+        messages = [
+            (f"Bench {i}", "Plain body", [f"user{i}@example.com"], "<p>HTML body</p>")
+            for i in range(options["messages"])
+        ]
+
+        with override_settings(**smtp_settings):
+            for name, run in (("send_mail", self._send_mail), ("pooled", self._pooled)):
+                handler = CountingHandler(options["transient_failures"])
+                controller = Controller(handler, hostname="127.0.0.1", port=options["port"])
+                controller.start()
+                try:
+                    started = time.perf_counter()
+                    failed = run(messages)
+                    elapsed = time.perf_counter() - started
+                finally:
+                    dispatch.close_pooled_connection()
+                    controller.stop()
+
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: {elapsed * 1000 / len(messages):.2f}ms/msg sessions={len(handler.sessions)} "
+                    f"delivered={handler.delivered}/{len(messages)} failed={failed} attempts={handler.attempts}"
+                ))
+
+    def _send_mail(self, messages):
+        failed = 0
+        for subject, body, to, html in messages:
+            try:
+                send_mail(subject, body, "bench@example.com", to, html_message=html)
+            except Exception:
+                failed += 1
+        return failed
+
+    def _pooled(self, messages):
+        return len(dispatch.send_messages([
+            dispatch.build_message(subject, body, to, html, from_email="bench@example.com")
+            for subject, body, to, html in messages
+        ]))
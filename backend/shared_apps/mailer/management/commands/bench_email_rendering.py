@@ -0,0 +1,68 @@
+"""
+Email rendering benchmark.
+
+Renders every email template with sample context through the old path
+(render_to_string + premailer.transform on each send) and the precompiled one,
+and reports CPU time per email. The one-off compile cost is shown separately.
+
+    python manage.py bench_email_rendering --iterations 200
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from premailer import transform
+
+from shared_apps.mailer.rendering import EMAIL_TEMPLATES, compiled_template, render_email
+
+SAMPLE_CONTEXT = {
+    "otp_code": "482913",
+    "full_name": "Jordan Lee",
+    "user_name": "Jordan Lee",
+    "pm_name": "Sam Rivera",
+    "developer_name": "Alex Kim",
+    "email": "jordan@example.com",
+    "tenant_name": "Acme",
+    "tenant_domain": "acme.teamora.website",
+    "login_url": "https://acme.teamora.website/login",
+    "reset_url": "https://acme.teamora.website/set-password/MQ/abc-123",
+    "project_names": ["Website", "Mobile App", "Billing"],
+    "old_role": "Developer",
+    "new_role": "Project Manager",
+}
+
+
+class Command(BaseCommand):
+    help = "Measures CPU time per rendered email, with and without precompiled templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=100, help="Renders per template and path.")
+        parser.add_argument("--templates", nargs="+", default=list(EMAIL_TEMPLATES), help="Templates to render.")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        for template_name in options["templates"]:
+            compiled_template.cache_clear()
+            started = time.process_time()
+            compiled_template(template_name)
+            compile_ms = (time.process_time() - started) * 1000
+
+            legacy = self._measure(
+                lambda: transform(render_to_string(template_name, SAMPLE_CONTEXT)), iterations
+            )
+            precompiled = self._measure(lambda: render_email(template_name, SAMPLE_CONTEXT), iterations)
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{template_name}: legacy p50={legacy:.3f}ms precompiled p50={precompiled:.3f}ms "
+                f"speedup={legacy / precompiled:.1f}x (one-off compile {compile_ms:.1f}ms)"
+            ))
+
+    def _measure(self, render, iterations):
+        samples = []
+        for _ in range(iterations):
+            started = time.process_time()
+            render()
+            samples.append((time.process_time() - started) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from shared_apps.mailer.outbox import requeue_dead
+
+
+class Command(BaseCommand):
+    help = "Moves dead-lettered EmailOutbox rows back to pending."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", type=int, nargs="*", help="Outbox ids to requeue; all dead rows if omitted.")
+
+    def handle(self, *args, **options):
+        count = requeue_dead(options["ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Requeued {count} email(s)."))
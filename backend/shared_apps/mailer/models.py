@@ -0,0 +1,41 @@
+from django.db import models
+from django.utils import timezone
+
+
+class EmailOutbox(models.Model):
+    """
+    An email task invocation recorded in the caller's transaction and run
+    later by the outbox dispatcher (see outbox.py). Lives in the public schema
+    so one dispatcher serves every tenant; schema_name is the tenant it was
+    written from and the key for rate limiting.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),
+    )
+
+    schema_name = models.CharField(max_length=63)
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The dispatcher only ever scans due pending rows.
+            models.Index(
+                fields=['available_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='email_outbox_due_idx',
+            ),
+            models.Index(fields=['status', 'sent_at'], name='email_outbox_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
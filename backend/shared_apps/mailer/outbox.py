@@ -0,0 +1,213 @@
+"""
+Transactional email outbox.
+
+enqueue() records an email task call as an EmailOutbox row in the caller's
+transaction instead of publishing it to the broker. A rolled-back request
+sends nothing, and a broker outage only delays mail. Once the transaction
+commits, the dispatcher is nudged. A beat task also runs it every few seconds
+to pick up anything the nudge missed.
+
+dispatch_outbox() claims due rows with SELECT ... FOR UPDATE SKIP LOCKED in a
+short transaction that leases them: available_at moves EMAIL_OUTBOX_LEASE
+seconds ahead and the attempt is counted. Any number of dispatchers can run
+side by side. The claimed tasks then run outside any transaction, each email
+goes out over the pooled SMTP connection, and each row's outcome is saved on
+its own. A dispatcher that dies mid-batch only costs its unfinished rows,
+which become due again when the lease runs out.
+
+- Rate limits: each tenant may send EMAIL_TENANT_RATE_LIMIT emails per minute
+  (EMAIL_PUBLIC_RATE_LIMIT for the public schema); the rest wait for the next
+  window.
+- Retries: a failed row is retried with exponential backoff.
+- Dead letters: after EMAIL_OUTBOX_MAX_ATTEMPTS a row is marked dead and kept
+  for inspection and requeue_dead().
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+import redis
+from celery import current_app
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name
+
+from core.utils.metrics import record_count, record_timing
+from shared_apps.mailer.models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL)
+
+
+def enqueue(task, *args, **kwargs):
+    """
+    Drop-in for task.delay(*args, **kwargs) that only takes effect if the
+    current transaction commits. Arguments must be JSON-serializable.
+    """
+    row = EmailOutbox.objects.create(
+        schema_name=getattr(connection, "schema_name", get_public_schema_name()),
+        task=task.name,
+        args=list(args),
+        kwargs=kwargs,
+    )
+    transaction.on_commit(_kick)
+    return row
+
+
+def _kick():
+    from shared_apps.mailer.tasks.outbox_tasks import dispatch_email_outbox_task
+
+    try:
+        dispatch_email_outbox_task.delay()
+    except Exception:
+        # The beat schedule picks the row up; the email is not lost.
+        logger.warning("Could not nudge the email outbox dispatcher", exc_info=True)
+
+
+def dispatch_outbox(batch_size=None, time_budget=None):
+    """
+    Sends due outbox rows in batches until none are left or the time budget
+    runs out. Returns the number sent.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    deadline = time.monotonic() + (time_budget or settings.EMAIL_OUTBOX_TIME_BUDGET)
+    sent = 0
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        claimed, delivered = _dispatch_batch(batch_size)
+        sent += delivered
+        if claimed:
+            record_timing("email_outbox.batch", time.monotonic() - started)
+        if claimed < batch_size:
+            break
+    return sent
+
+
+def _dispatch_batch(batch_size):
+    """
+    Claims and sends one batch. Returns (claimed, delivered).
+    """
+    rows = _claim(batch_size)
+    delivered = sum(_run(row) for row in rows)
+    record_count("email_outbox.sent", delivered)
+    return len(rows), delivered
+
+
+def _claim(batch_size):
+    """
+    Leases due rows the tenants have budget for and pushes the rest to the
+    next rate-limit window. Returns the leased rows.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.filter(status='pending', available_at__lte=now)
+            .order_by('available_at', 'id')
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not rows:
+            return []
+
+        allowed = _within_rate_limit(rows)
+        leased_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        for row in rows:
+            if row.id in allowed:
+                row.available_at = leased_until
+                row.attempts += 1
+            else:
+                # Over the tenant's budget for this minute.
+                row.available_at = _next_window(now)
+
+        EmailOutbox.objects.bulk_update(rows, ['available_at', 'attempts'])
+
+    return [row for row in rows if row.id in allowed]
+
+
+def _run(row):
+    try:
+        current_app.tasks[row.task](*row.args, **row.kwargs)
+    except Exception as error:
+        last_error = f"{type(error).__name__}: {error}"
+        if row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            EmailOutbox.objects.filter(id=row.id).update(status='dead', last_error=last_error)
+            record_count("email_outbox.dead")
+            logger.error(f"Outbox email {row.id} ({row.task}) dead after {row.attempts} attempts: {error}")
+        else:
+            delay = settings.EMAIL_OUTBOX_RETRY_BACKOFF * 2 ** (row.attempts - 1)
+            EmailOutbox.objects.filter(id=row.id).update(
+                available_at=timezone.now() + timedelta(seconds=delay), last_error=last_error
+            )
+            logger.warning(f"Outbox email {row.id} ({row.task}) failed; retrying in {delay}s: {error}")
+        return False
+
+    EmailOutbox.objects.filter(id=row.id).update(status='sent', sent_at=timezone.now())
+    return True
+
+
+def _within_rate_limit(rows):
+    """
+    Ids of the rows each tenant still has budget for in the current minute.
+    Budget is taken with INCRBY and handed back for rows that do not fit.
+    """
+    window = int(time.time() // 60)
+    by_schema = {}
+    for row in rows:
+        by_schema.setdefault(row.schema_name, []).append(row.id)
+
+    pipe = redis_client.pipeline(transaction=False)
+    for schema_name, ids in by_schema.items():
+        key = f"mailer:rate:{schema_name}:{window}"
+        pipe.incrby(key, len(ids))
+        pipe.expire(key, 120)
+    totals = pipe.execute()[::2]
+
+    allowed = set()
+    refunds = redis_client.pipeline(transaction=False)
+    for (schema_name, ids), total in zip(by_schema.items(), totals):
+        limit = _rate_limit(schema_name)
+        fits = max(0, min(len(ids), limit - (total - len(ids))))
+        allowed.update(ids[:fits])
+        if fits < len(ids):
+            refunds.decrby(f"mailer:rate:{schema_name}:{window}", len(ids) - fits)
+    if len(refunds):
+        refunds.execute()
+    return allowed
+
+
+def _rate_limit(schema_name):
+    if schema_name == get_public_schema_name():
+        return settings.EMAIL_PUBLIC_RATE_LIMIT
+    return settings.EMAIL_TENANT_RATE_LIMIT
+
+
+def _next_window(now):
+    return now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+
+def requeue_dead(ids=None):
+    """
+    Puts dead rows (all, or only `ids`) back in the queue. Returns how many.
+    """
+    rows = EmailOutbox.objects.filter(status='dead')
+    if ids is not None:
+        rows = rows.filter(id__in=ids)
+    return rows.update(status='pending', attempts=0, available_at=timezone.now(), last_error='')
+
+
+def purge_sent(days=None):
+    """
+    Deletes sent rows older than EMAIL_OUTBOX_KEEP_DAYS in small batches.
+    """
+    cutoff = timezone.now() - timedelta(days=days or settings.EMAIL_OUTBOX_KEEP_DAYS)
+    total = 0
+    while True:
+        ids = list(
+            EmailOutbox.objects.filter(status='sent', sent_at__lt=cutoff)
+            .values_list('id', flat=True)[:settings.RETENTION_BATCH_SIZE]
+        )
+        if not ids:
+            return total
+        total += EmailOutbox.objects.filter(id__in=ids).delete()[0]
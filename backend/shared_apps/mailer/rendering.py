@@ -0,0 +1,75 @@
+"""
+Precompiled email templates.
+
+premailer re-parses a document and its CSS on every call, which made it the
+most expensive step of every email task. The CSS in our templates does not
+depend on the context, so it is inlined into the template source once, the
+result is compiled as a Django template and cached per process, and each send
+only renders the context into it.
+
+Worker processes warm the cache for EMAIL_TEMPLATES when they start; any other
+template is compiled on first use.
+"""
+
+import logging
+import re
+from functools import lru_cache
+
+from celery.signals import worker_process_init
+from django.template import engines
+from django.template.loader import get_template
+from premailer import Premailer
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_TAG = re.compile(r"{{.*?}}|{%.*?%}|{#.*?#}", re.DOTALL)
+PLACEHOLDER = re.compile(r"djtpl(\d+)x")
+
+EMAIL_TEMPLATES = (
+    "emails/otp_email.html",
+    "emails/set_password_email.html",
+    "emails/tenant_created.html",
+    "emails/workspace_access.html",
+    "emails/project_management/pm_blocking_subtasks_email.html",
+    "emails/project_management/role_changed_email.html",
+)
+
+
+@lru_cache(maxsize=None)
+def compiled_template(template_name):
+    """
+    The template with its CSS already inlined, compiled once per process.
+    """
+    source = get_template(template_name).template.source
+
+    # The HTML serializer would URL-escape tags inside href/src, so tags are
+    # swapped for inert placeholders while premailer works and put back after.
+    tags = []
+
+    def stash(match):
+        tags.append(match.group(0))
+        return f"djtpl{len(tags) - 1}x"
+
+    inlined = Premailer(TEMPLATE_TAG.sub(stash, source)).transform()
+    inlined = PLACEHOLDER.sub(lambda match: tags[int(match.group(1))], inlined)
+    return engines["django"].from_string(inlined)
+
+
+def render_email(template_name, context):
+    """
+    Drop-in for transform(render_to_string(template_name, context)).
+    """
+    return compiled_template(template_name).render(context)
+
+
+def warm_templates(template_names=EMAIL_TEMPLATES):
+    for template_name in template_names:
+        try:
+            compiled_template(template_name)
+        except Exception:
+            logger.exception(f"Could not precompile email template {template_name}")
+
+
+@worker_process_init.connect
+def warm_on_worker_start(**kwargs):
+    warm_templates()
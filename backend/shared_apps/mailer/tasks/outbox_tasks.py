@@ -0,0 +1,19 @@
+from celery import shared_task
+
+from shared_apps.mailer.outbox import dispatch_outbox, purge_sent
+
+
+@shared_task(ignore_result=True)
+def dispatch_email_outbox_task():
+    """
+    Sends due EmailOutbox rows; nudged on commit and run by beat as a safety net.
+    """
+    return dispatch_outbox()
+
+
+@shared_task(ignore_result=True)
+def purge_email_outbox_task():
+    """
+    Deletes sent outbox rows older than EMAIL_OUTBOX_KEEP_DAYS.
+    """
+    return purge_sent()
@@ -0,0 +1,209 @@
+import logging
+import smtplib
+import socket
+from datetime import timedelta
+
+from aiosmtpd.controller import Controller
+from celery import shared_task
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from shared_apps.mailer import dispatch, outbox
+from shared_apps.mailer.models import EmailOutbox
+
+sent = []
+failures_left = {}
+
+
+@shared_task(name="shared_apps.mailer.tests.record_email")
+def record_email(to):
+    if failures_left.get(to):
+        failures_left[to] -= 1
+        raise ConnectionError("SMTP server went away")
+    sent.append(to)
+
+
+@override_settings(EMAIL_OUTBOX_BATCH_SIZE=10, EMAIL_PUBLIC_RATE_LIMIT=100, EMAIL_TENANT_RATE_LIMIT=100)
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        sent.clear()
+        failures_left.clear()
+        for key in outbox.redis_client.scan_iter("mailer:rate:*"):
+            outbox.redis_client.delete(key)
+
+    def make_due(self, row):
+        EmailOutbox.objects.filter(id=row.id).update(available_at=timezone.now() - timedelta(seconds=1))
+
+    def test_failed_row_is_retried_without_resending_delivered_rows(self):
+        first = outbox.enqueue(record_email, "first@example.com")
+        flaky = outbox.enqueue(record_email, "flaky@example.com")
+        last = outbox.enqueue(record_email, "last@example.com")
+        failures_left["flaky@example.com"] = 1
+
+        self.assertEqual(outbox.dispatch_outbox(), 2)
+        flaky.refresh_from_db()
+        self.assertEqual(flaky.status, 'pending')
+        self.assertEqual(flaky.attempts, 1)
+        self.assertIn("ConnectionError", flaky.last_error)
+        self.assertGreater(flaky.available_at, timezone.now())
+
+        # Nothing is due until the backoff has passed.
+        self.assertEqual(outbox.dispatch_outbox(), 0)
+
+        self.make_due(flaky)
+        self.assertEqual(outbox.dispatch_outbox(), 1)
+
+        self.assertEqual(sent, ["first@example.com", "last@example.com", "flaky@example.com"])
+        for row in (first, flaky, last):
+            row.refresh_from_db()
+            self.assertEqual(row.status, 'sent')
+        self.assertEqual(flaky.attempts, 2)
+
+    def test_claimed_rows_are_leased_until_they_finish(self):
+        row = outbox.enqueue(record_email, "lease@example.com")
+
+        self.assertEqual([claimed.id for claimed in outbox._claim(10)], [row.id])
+        # Another dispatcher finds nothing while the lease runs.
+        self.assertEqual(outbox._claim(10), [])
+
+        # The claiming dispatcher died; once the lease is up the row is sent once.
+        self.make_due(row)
+        self.assertEqual(outbox.dispatch_outbox(), 1)
+        self.assertEqual(sent, ["lease@example.com"])
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_row_is_dead_lettered_after_max_attempts(self):
+        row = outbox.enqueue(record_email, "dead@example.com")
+        failures_left["dead@example.com"] = 5
+
+        outbox.dispatch_outbox()
+        self.make_due(row)
+        outbox.dispatch_outbox()
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'dead')
+        self.assertEqual(row.attempts, 2)
+        self.assertEqual(outbox.requeue_dead([row.id]), 1)
+
+
+class RecordingSMTPHandler:
+    """
+    Local SMTP stand-in. `replies` maps a delivery attempt number (1-based)
+    to the reply sent instead of 250; `refused` recipients fail at RCPT.
+    """
+
+    def __init__(self, replies=None, refused=()):
+        self.replies = replies or {}
+        self.refused = set(refused)
+        self.attempts = 0
+        self.delivered = []
+        self.sessions = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.sessions.add(id(session))
+        if address in self.refused:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.attempts += 1
+        reply = self.replies.get(self.attempts)
+        if reply:
+            return reply
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class EmailDispatchTests(SimpleTestCase):
+    def setUp(self):
+        # aiosmtpd logs every SMTP command at INFO.
+        mail_log = logging.getLogger("mail.log")
+        self.addCleanup(mail_log.setLevel, mail_log.level)
+        mail_log.setLevel(logging.WARNING)
+        self.port = free_port()
+        self.enterContext(override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_SEND_ATTEMPTS=3,
+            EMAIL_RETRY_BACKOFF=0.01,
+        ))
+        self.addCleanup(dispatch.close_pooled_connection)
+
+    def start_server(self, handler=None, **handler_options):
+        handler = handler or RecordingSMTPHandler(**handler_options)
+        controller = Controller(handler, hostname="127.0.0.1", port=self.port)
+        controller.start()
+        self.addCleanup(self.stop_server, controller)
+        return handler, controller
+
+    def stop_server(self, controller):
+        if controller.loop.is_running():
+            controller.stop()
+
+    def messages(self, *recipients):
+        return [
+            dispatch.build_message("Hello", "Body", [to], "<p>Body</p>", from_email="app@example.com")
+            for to in recipients
+        ]
+
+    def test_batch_goes_over_one_session(self):
+        handler, _ = self.start_server()
+        recipients = [f"user{i}@example.com" for i in range(5)]
+
+        self.assertEqual(dispatch.send_messages(self.messages(*recipients)), [])
+
+        self.assertEqual(handler.delivered, recipients)
+        self.assertEqual(len(handler.sessions), 1)
+
+    def test_transient_failure_is_retried_then_delivered(self):
+        handler, _ = self.start_server(replies={2: "451 Try again later"})
+
+        self.assertEqual(dispatch.send_messages(self.messages("a@example.com", "b@example.com")), [])
+
+        self.assertEqual(handler.delivered, ["a@example.com", "b@example.com"])
+        self.assertEqual(handler.attempts, 3)
+        self.assertEqual(len(handler.sessions), 1)
+
+    def test_permanent_rejection_is_not_retried(self):
+        handler, _ = self.start_server(replies={1: "554 Message rejected"})
+
+        failed = dispatch.send_messages(self.messages("a@example.com", "b@example.com"))
+
+        self.assertEqual([message.to for message, _ in failed], [["a@example.com"]])
+        self.assertEqual(failed[0][1].smtp_code, 554)
+        self.assertEqual(handler.attempts, 2)
+        self.assertEqual(handler.delivered, ["b@example.com"])
+
+    def test_refused_recipient_is_not_retried(self):
+        handler, _ = self.start_server(refused={"gone@example.com"})
+
+        failed = dispatch.send_messages(self.messages("gone@example.com", "b@example.com"))
+
+        self.assertEqual(len(failed), 1)
+        self.assertIsInstance(failed[0][1], smtplib.SMTPRecipientsRefused)
+        self.assertEqual(handler.attempts, 1)
+        self.assertEqual(handler.delivered, ["b@example.com"])
+
+    def test_dropped_connection_is_reopened(self):
+        handler, controller = self.start_server()
+        self.assertEqual(dispatch.send_messages(self.messages("a@example.com")), [])
+
+        # The server goes away with the pooled session still open, then comes back.
+        controller.stop()
+        self.start_server(handler)
+
+        self.assertEqual(dispatch.send_messages(self.messages("b@example.com")), [])
+        self.assertEqual(handler.delivered, ["a@example.com", "b@example.com"])
+        self.assertEqual(len(handler.sessions), 2)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0003_client_is_blocked'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RetentionArchiveChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schema_name', models.CharField(max_length=63)),
+                ('model', models.CharField(max_length=100)),
+                ('first_pk', models.BigIntegerField()),
+                ('last_pk', models.BigIntegerField()),
+                ('row_count', models.PositiveIntegerField()),
+                ('payload', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['schema_name', 'model', 'created_at'], name='retention_chunk_lookup_idx')],
+            },
+        ),
+    ]
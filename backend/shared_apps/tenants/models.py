@@ -14,4 +14,23 @@ class Client(TenantMixin):
         return self.name
 
 class Domain(DomainMixin):
-    pass
\ No newline at end of file
+    pass
+
+class RetentionArchiveChunk(models.Model):
+    """
+    One batch of expired tenant rows moved out by the retention engine, stored
+    as zlib-compressed NDJSON. Lives in the public schema so archives outlast
+    the tables (and tenants) they came from.
+    """
+    schema_name = models.CharField(max_length=63)
+    model = models.CharField(max_length=100)
+    first_pk = models.BigIntegerField()
+    last_pk = models.BigIntegerField()
+    row_count = models.PositiveIntegerField()
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['schema_name', 'model', 'created_at'], name='retention_chunk_lookup_idx'),
+        ]
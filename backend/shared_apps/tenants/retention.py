@@ -0,0 +1,147 @@
+"""
+Retention engine for high-volume tenant tables.
+
+RETENTION_POLICIES lists what expires. Each policy is a dict with:
+
+    model   app label and model name, e.g. "notifications.Notification"
+    field   indexed timestamp column the age is measured on
+    days    rows older than this expire
+    filter  optional extra lookups, e.g. {"is_read": True}
+    action  "delete" (default) or "archive"; archive keeps the rows as
+            compressed RetentionArchiveChunk rows in the public schema
+    hook    optional dotted path called as hook(schema_name, rows) with the
+            deleted rows, for caches that count them
+
+Rows go in batches of RETENTION_BATCH_SIZE. Each batch is a single
+DELETE ... WHERE pk IN (SELECT ... ORDER BY field LIMIT n FOR UPDATE SKIP LOCKED)
+in its own short transaction with lock_timeout set, so a purge never waits
+behind, or holds up, live traffic. A batch that cannot get its lock is left
+for the next run.
+
+Between batches the engine sleeps so that it is busy for at most
+RETENTION_MAX_DUTY_CYCLE of the wall clock, and it stops when
+RETENTION_TIME_BUDGET runs out. Whatever is left is picked up on the next run.
+"""
+
+import json
+import logging
+import time
+import zlib
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django_tenants.utils import get_public_schema_name, get_tenant_model, schema_context
+
+from core.utils.metrics import record_count, record_timing
+from shared_apps.tenants.models import RetentionArchiveChunk
+
+logger = logging.getLogger(__name__)
+
+
+def run_retention(policies=None, time_budget=None):
+    """
+    Applies every policy in every tenant. Returns {schema_name: {model: rows}}
+    for whatever was purged, and reports the same through record_count.
+    """
+    policies = settings.RETENTION_POLICIES if policies is None else policies
+    deadline = time.monotonic() + (time_budget or settings.RETENTION_TIME_BUDGET)
+    started = time.monotonic()
+    report = {}
+
+    tenants = get_tenant_model().objects.exclude(schema_name=get_public_schema_name())
+    for schema_name in tenants.values_list('schema_name', flat=True):
+        with schema_context(schema_name):
+            for policy in policies:
+                if time.monotonic() >= deadline:
+                    logger.info("Retention time budget used up; resuming next run")
+                    break
+                try:
+                    purged = apply_policy(schema_name, policy, deadline)
+                except Exception:
+                    logger.exception(f"Retention for {policy['model']} in {schema_name} failed; will retry next run")
+                    continue
+                if purged:
+                    report.setdefault(schema_name, {})
+                    report[schema_name][policy['model']] = report[schema_name].get(policy['model'], 0) + purged
+                    record_count(f"retention.purged.{policy['model']}", purged)
+                    record_count(f"retention.purged.{policy['model']}.{schema_name}", purged)
+                    logger.info(f"Retention purged {purged} {policy['model']} rows in {schema_name}")
+
+    record_timing("retention.run", time.monotonic() - started)
+    return report
+
+
+def apply_policy(schema_name, policy, deadline):
+    model = apps.get_model(policy['model'])
+    cutoff = timezone.now() - timedelta(days=policy['days'])
+    hook = import_string(policy['hook']) if policy.get('hook') else None
+    expired = (
+        model.objects.filter(**{f"{policy['field']}__lt": cutoff}, **policy.get('filter', {}))
+        .order_by(policy['field'])
+        .values('pk')
+    )
+
+    purged = 0
+    while time.monotonic() < deadline:
+        batch_started = time.monotonic()
+        try:
+            rows = _purge_batch(schema_name, model, expired, policy.get('action', 'delete'), hook)
+        except OperationalError:
+            # lock_timeout or statement_timeout hit: something holds the table.
+            logger.warning(f"Retention batch for {policy['model']} in {schema_name} timed out; skipping")
+            break
+
+        purged += rows
+        if rows < settings.RETENTION_BATCH_SIZE:
+            break
+        _throttle(time.monotonic() - batch_started)
+    return purged
+
+
+def _purge_batch(schema_name, model, expired, action, hook):
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # SET takes no bind parameters; both values are ints (milliseconds).
+            cursor.execute(f"SET LOCAL lock_timeout = {int(settings.RETENTION_LOCK_TIMEOUT_MS)}")
+            cursor.execute(f"SET LOCAL statement_timeout = {int(settings.RETENTION_STATEMENT_TIMEOUT_MS)}")
+
+            batch = expired.select_for_update(skip_locked=True)[:settings.RETENTION_BATCH_SIZE]
+            select_sql, params = batch.query.sql_with_params()
+            cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({select_sql}) RETURNING *", params)
+            columns = [column.name for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        if rows and action == 'archive':
+            _archive(schema_name, model, rows)
+        if rows and hook:
+            # Runs after commit so caches never count rows that were rolled back.
+            transaction.on_commit(lambda: hook(schema_name, rows))
+    return len(rows)
+
+
+def _archive(schema_name, model, rows):
+    pk = model._meta.pk.column
+    rows.sort(key=lambda row: row[pk])
+    payload = "\n".join(json.dumps(row, cls=DjangoJSONEncoder) for row in rows)
+    RetentionArchiveChunk.objects.create(
+        schema_name=schema_name,
+        model=model._meta.label,
+        first_pk=rows[0][pk],
+        last_pk=rows[-1][pk],
+        row_count=len(rows),
+        payload=zlib.compress(payload.encode(), level=9),
+    )
+
+
+def _throttle(batch_seconds):
+    duty_cycle = settings.RETENTION_MAX_DUTY_CYCLE
+    if 0 < duty_cycle < 1:
+        time.sleep(batch_seconds * (1 - duty_cycle) / duty_cycle)
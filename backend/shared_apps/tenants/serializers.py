@@ -13,6 +13,7 @@ from shared_apps.custom_auth.models import User
 from tenant_apps.employee.models import Employee
 from core.constants import UserRoles
 from shared_apps.tenants.tasks.email_tasks import send_tenant_created_email_task
+from shared_apps.mailer.outbox import enqueue
 
 
 class TenantSignupSerializer(serializers.Serializer):
@@ -162,6 +163,6 @@ class TenantSignupSerializer(serializers.Serializer):
             )
 
         # Step 6: Send email
-        send_tenant_created_email_task.delay(to_email=user.email, tenant_domain=domain_url)
+        enqueue(send_tenant_created_email_task, to_email=user.email, tenant_domain=domain_url)
 
         return tenant
\ No newline at end of file
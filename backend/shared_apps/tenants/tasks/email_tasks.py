@@ -1,26 +1,21 @@
 from celery import shared_task
-from django.core.mail import send_mail
-from django.conf import settings
-from django.template.loader import render_to_string
-from premailer import transform
+from shared_apps.mailer.dispatch import send_email
+from shared_apps.mailer.rendering import render_email
 
 
 @shared_task
 def send_otp_email_task(subject, otp_code, recipient_list):
-    html_message = render_to_string('emails/otp_email.html', {
+    html_message = render_email('emails/otp_email.html', {
         'otp_code': otp_code
     })
-    html_message = transform(html_message)
 
     text_message = f"Your One-Time Password (OTP) is: {otp_code}"
 
-    send_mail(
+    send_email(
         subject=subject,
         message=text_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=recipient_list,
         html_message=html_message,
-        fail_silently=False,
     )
 
 
@@ -29,11 +24,10 @@ def send_tenant_created_email_task(to_email, tenant_domain):
     subject = "🎉 Your Teamora Tenant is Ready!"
     login_url = f"http://{tenant_domain}/login"
 
-    html_message = render_to_string('emails/tenant_created.html', {
+    html_message = render_email('emails/tenant_created.html', {
         'tenant_domain': tenant_domain,
         'login_url': login_url,
     })
-    html_message = transform(html_message)
 
     text_message = f"""
         🎉 Your Teamora Tenant is Ready!
@@ -44,13 +38,11 @@ def send_tenant_created_email_task(to_email, tenant_domain):
         Login: {login_url}
         """
 
-    send_mail(
+    send_email(
         subject=subject,
         message=text_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[to_email],
         html_message=html_message,
-        fail_silently=False,
     )
 
 
@@ -64,12 +56,11 @@ def send_workspace_access_email_task(email, tenant_domain, user_name):
     # Create login URL for the specific tenant subdomain
     login_url = f"https://{tenant_domain}/login"
     
-    html_message = render_to_string('emails/workspace_access.html', {
+    html_message = render_email('emails/workspace_access.html', {
         'user_name': user_name,
         'tenant_domain': tenant_domain,
         'login_url': login_url,
     })
-    html_message = transform(html_message)
 
     text_message = f"""
         🔗 Access Your Teamora Workspace
@@ -88,11 +79,9 @@ def send_workspace_access_email_task(email, tenant_domain, user_name):
         Teamora Team
         """
 
-    send_mail(
+    send_email(
         subject=subject,
         message=text_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[email],
         html_message=html_message,
-        fail_silently=False,
     )
\ No newline at end of file
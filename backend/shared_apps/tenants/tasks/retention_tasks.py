@@ -0,0 +1,11 @@
+from celery import shared_task
+
+from shared_apps.tenants.retention import run_retention
+
+
+@shared_task(ignore_result=True)
+def run_retention_task():
+    """
+    Purges or archives expired rows in every tenant per RETENTION_POLICIES.
+    """
+    return run_retention()
@@ -20,5 +20,6 @@ urlpatterns = [
         
         path('super-admin-dashboard/', views.super_admin_dashboard, name='super_admin_dashboard'),
         path('toggle-block/<int:tenant_id>/', views.toggle_block_tenant, name='toggle_block_tenant'),
+        path('system-metrics/', views.system_metrics, name='system_metrics'),
     ])),
 ]
\ No newline at end of file
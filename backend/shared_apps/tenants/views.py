@@ -7,6 +7,7 @@ from rest_framework.authentication import SessionAuthentication, BasicAuthentica
 
 from shared_apps.tenants.models import Client, Domain
 from shared_apps.tenants.tasks.email_tasks import send_otp_email_task, send_workspace_access_email_task
+from shared_apps.mailer.outbox import enqueue
 from shared_apps.tenants.serializers import TenantSignupSerializer
 from shared_apps.tenants.utils import is_valid_subdomain, validate_tenant_name_format
 from shared_apps.custom_auth.models import User
@@ -19,6 +20,8 @@ from django.db import transaction
 from django.conf import settings
 
 from core.permissions import IsTenantAdmin
+from core.utils.celery_metrics import queue_depths
+from core.utils.metrics import get_counts, get_timings
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
@@ -143,8 +146,8 @@ class SendOTPView(APIView):
 
         subject = 'Your OTP for Workspace Signup'
 
-        # Send the OTP via Celery (with HTML template support)
-        send_otp_email_task.delay(subject, otp, [email])
+        # Queue the OTP email in the outbox (sent by a Celery dispatcher)
+        enqueue(send_otp_email_task, subject, otp, [email])
 
         return Response({'detail': 'OTP sent successfully.'}, status=status.HTTP_200_OK)
 
@@ -217,6 +220,12 @@ def toggle_block_tenant(request, tenant_id):
         return Response({"error": "Tenant not found"}, status=404)
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def system_metrics(request):
+    return Response({"timings": get_timings(), "counts": get_counts(), "queues": queue_depths()})
+
+
 class FindWorkspaceView(APIView):
     """
     API to find if a user exists in any organization and send them a login link
@@ -256,8 +265,9 @@ class FindWorkspaceView(APIView):
                 'detail': 'If a workspace exists for this email, we have sent login instructions.'
             }, status=status.HTTP_200_OK)
 
-        # Send the workspace access email via Celery
-        send_workspace_access_email_task.delay(
+        # Queue the workspace access email in the outbox
+        enqueue(
+            send_workspace_access_email_task,
             email=email,
             tenant_domain=domain.domain,
             user_name=user.name
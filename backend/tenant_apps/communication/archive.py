@@ -0,0 +1,170 @@
+"""
+Chat message archive.
+
+Messages older than CHAT_ARCHIVE_AFTER_DAYS move out of communication_message
+into MessageArchiveChunk rows: one chunk per run of up to CHAT_ARCHIVE_BATCH_SIZE
+messages from a single room and calendar month, stored as zlib-compressed
+NDJSON. Each room's last message stays live so room previews keep working.
+
+ChatRoomMessagesView reads through to the archive once live rows run out, so
+clients page through history the same way either side of the cut-off.
+Archived messages are not covered by full-text search.
+"""
+
+import json
+import logging
+import time
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_tenants.utils import get_public_schema_name, get_tenant_model, schema_context
+
+from core.utils.metrics import record_timing
+from shared_apps.custom_auth.models import User
+from tenant_apps.communication.models import ChatRoom, Message, MessageArchiveChunk
+
+logger = logging.getLogger(__name__)
+
+
+def archive_old_messages():
+    """
+    Archives old messages in every tenant. Returns the number of messages moved.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.CHAT_ARCHIVE_AFTER_DAYS)
+    started = time.monotonic()
+    total = 0
+
+    tenants = get_tenant_model().objects.exclude(schema_name=get_public_schema_name())
+    for schema_name in tenants.values_list('schema_name', flat=True):
+        with schema_context(schema_name):
+            room_ids = Message.objects.filter(timestamp__lt=cutoff).values_list('room_id', flat=True).distinct()
+            for room_id in room_ids:
+                try:
+                    total += archive_room(room_id, cutoff)
+                except Exception:
+                    logger.exception(f"Archiving room {room_id} in {schema_name} failed; will retry next run")
+
+    record_timing("chat_archive.run", time.monotonic() - started)
+    return total
+
+
+def archive_room(room_id, cutoff, batch_size=None):
+    batch_size = batch_size or settings.CHAT_ARCHIVE_BATCH_SIZE
+    last_message_id = ChatRoom.objects.filter(id=room_id).values_list('last_message_id', flat=True).first()
+    candidates = Message.objects.filter(room_id=room_id, timestamp__lt=cutoff).exclude(id=last_message_id)
+
+    moved = 0
+    while True:
+        oldest = candidates.order_by('timestamp', 'id').values_list('timestamp', flat=True).first()
+        if oldest is None:
+            return moved
+
+        # Chunks never span months, so a month can later be dropped or restored on its own.
+        month_start = oldest.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+
+        with transaction.atomic():
+            rows = list(
+                candidates.filter(timestamp__lt=min(cutoff, next_month))
+                .order_by('timestamp', 'id')
+                .select_for_update(skip_locked=True)
+                .values('id', 'sender_id', 'content', 'timestamp')[:batch_size]
+            )
+            if not rows:
+                return moved
+
+            MessageArchiveChunk.objects.create(
+                room_id=room_id,
+                first_message_id=rows[0]['id'],
+                last_message_id=rows[-1]['id'],
+                first_timestamp=rows[0]['timestamp'],
+                last_timestamp=rows[-1]['timestamp'],
+                message_count=len(rows),
+                payload=_pack(rows),
+            )
+            Message.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+
+
+def _pack(rows):
+    lines = (
+        json.dumps({
+            'id': row['id'],
+            'sender': row['sender_id'],
+            'content': row['content'],
+            'timestamp': row['timestamp'].isoformat(),
+        })
+        for row in rows
+    )
+    return zlib.compress("\n".join(lines).encode(), level=9)
+
+
+def _unpack(chunk):
+    for line in zlib.decompress(chunk.payload).decode().splitlines():
+        row = json.loads(line)
+        row['timestamp'] = parse_datetime(row['timestamp'])
+        yield row
+
+
+def messages_before(room_id, boundary, limit):
+    """
+    Up to `limit` archived messages older than boundary (timestamp, id), newest
+    first. A boundary of None starts from the newest archived message.
+    """
+    chunks = MessageArchiveChunk.objects.filter(room_id=room_id).order_by('-last_timestamp', '-last_message_id')
+    if boundary:
+        chunks = chunks.filter(first_timestamp__lte=boundary[0])
+
+    found = []
+    for chunk in chunks.iterator():
+        rows = [row for row in _unpack(chunk) if not boundary or (row['timestamp'], row['id']) < boundary]
+        found.extend(sorted(rows, key=lambda row: (row['timestamp'], row['id']), reverse=True))
+        if len(found) >= limit:
+            break
+    return found[:limit]
+
+
+def messages_after(room_id, boundary, limit):
+    """
+    Up to `limit` archived messages newer than boundary (timestamp, id), oldest first.
+    """
+    chunks = (
+        MessageArchiveChunk.objects.filter(room_id=room_id, last_timestamp__gte=boundary[0])
+        .order_by('first_timestamp', 'first_message_id')
+    )
+
+    found = []
+    for chunk in chunks.iterator():
+        rows = [row for row in _unpack(chunk) if (row['timestamp'], row['id']) > boundary]
+        found.extend(sorted(rows, key=lambda row: (row['timestamp'], row['id'])))
+        if len(found) >= limit:
+            break
+    return found[:limit]
+
+
+def serialize_archived(rows, watermarks):
+    """
+    Shapes archived rows like MessageSerializer output.
+    """
+    if not rows:
+        return []
+    senders = {
+        user_id: name or email or f"User {user_id}"
+        for user_id, name, email in User.objects.filter(id__in={row['sender'] for row in rows})
+        .values_list('id', 'name', 'email')
+    }
+    return [
+        {
+            'id': row['id'],
+            'sender': row['sender'],
+            'sender_name': senders.get(row['sender'], f"User {row['sender']}"),
+            'content': row['content'],
+            'timestamp': row['timestamp'].isoformat(),
+            'seen_by': [user_id for user_id, last_read in watermarks.items() if last_read >= row['id']],
+        }
+        for row in rows
+    ]
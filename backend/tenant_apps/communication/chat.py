@@ -0,0 +1,59 @@
+"""
+Chat operations shared by ChatConsumer (one socket per room) and
+MultiplexConsumer (one socket per user, many rooms).
+"""
+
+import uuid
+
+from channels.db import database_sync_to_async
+from django_tenants.utils import schema_context
+
+from . import write_behind
+from .events import chat_message_event, room_group_name
+from .models import Message, RoomReadState
+
+
+def parse_room_id(raw):
+    try:
+        return uuid.UUID(str(raw))
+    except ValueError:
+        return None
+
+
+async def post_message(channel_layer, schema_name, room_pk, sender_id, sender_name, content, temp_id=None):
+    """
+    Stores a message (directly or through write-behind) and broadcasts it to the room.
+    """
+    if write_behind.is_enabled():
+        message_id, timestamp = await write_behind.append_message(
+            schema_name, room_pk, sender_id, sender_name, content
+        )
+    else:
+        message = await save_message(schema_name, room_pk, sender_id, content)
+        message_id, timestamp = str(message.id), message.timestamp
+
+    await channel_layer.group_send(
+        room_group_name(room_pk),
+        chat_message_event(room_pk, message_id, sender_id, sender_name, timestamp.isoformat(), content, temp_id),
+    )
+
+
+@database_sync_to_async
+def save_message(schema_name, room_pk, sender_id, content):
+    with schema_context(schema_name):
+        return Message.objects.create(room_id=room_pk, sender_id=sender_id, content=content)
+
+
+@database_sync_to_async
+def mark_seen(schema_name, room_pk, user_id, message_id):
+    if write_behind.is_stream_id(message_id):
+        lookup = {'stream_id': message_id}
+    else:
+        try:
+            lookup = {'message_id': int(message_id)}
+        except (TypeError, ValueError):
+            return
+
+    with schema_context(schema_name):
+        # No-op when the message is not flushed yet (write-behind) or was deleted.
+        RoomReadState.objects.advance(room_pk, user_id, **lookup)
@@ -1,106 +1,68 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
-from django_tenants.utils import schema_context
-from django.apps import apps
+from django.conf import settings
+import asyncio
 import json
 
+from . import chat, membership, presence
+from .events import read_chat_message_event, room_group_name
+
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.room_id = self.scope['url_route']['kwargs']['room_id']
-        self.room_group_name = f"chat_{self.room_id}"
+        self.room_pk = chat.parse_room_id(self.room_id)
+        # Canonical form, so membership signals can address the group by room pk.
+        self.room_group_name = room_group_name(self.room_pk)
 
         if not self.scope["user"].is_authenticated:
             await self.close(code=4401)
             return
 
-        try:
-            await self.validate_user_in_room()
-        except Exception as e:
+        # Cached for the lifetime of the socket so each message is a single INSERT.
+        user = self.scope["user"]
+        self.schema_name = self.scope["tenant"].schema_name
+        self.sender_id = user.id
+        self.sender_name = user.get_full_name() or user.email
+
+        if self.room_pk is None or not await membership.is_member(self.schema_name, self.room_pk, self.sender_id):
             await self.close(code=4403)
             return
 
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
-        await self.mark_user_online()
+        await presence.connect(self.sender_id, self.channel_name)
+        self.heartbeat_task = asyncio.create_task(self.heartbeat())
 
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
-        await self.mark_user_offline()
+
+        # connect() may have closed the socket before presence was registered.
+        heartbeat_task = getattr(self, 'heartbeat_task', None)
+        if heartbeat_task:
+            heartbeat_task.cancel()
+            await presence.disconnect(self.sender_id, self.channel_name)
+
+    async def heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.PRESENCE_HEARTBEAT_INTERVAL)
+            await presence.heartbeat(self.sender_id, self.channel_name)
 
     async def receive(self, text_data):
         data = json.loads(text_data)
         message = data.get('message')
-        temp_id = data.get('temp_id')
-        sender_id = self.scope["user"].id
 
         if data.get("type") == "seen":
-            await self.mark_message_seen(data["message_id"], sender_id)
+            await chat.mark_seen(self.schema_name, self.room_pk, self.sender_id, data["message_id"])
 
         elif message:
-            message_obj = await self.save_message(sender_id, message)
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'chat_message',
-                    'message': message_obj.content,
-                    'sender_id': sender_id,
-                    'sender_name': message_obj.sender.get_full_name() or message_obj.sender.email,
-                    'timestamp': message_obj.timestamp.isoformat(),
-                    'id': str(message_obj.id),
-                    'temp_id': temp_id,
-                }
+            await chat.post_message(
+                self.channel_layer, self.schema_name, self.room_pk,
+                self.sender_id, self.sender_name, message, data.get('temp_id'),
             )
 
     async def chat_message(self, event):
-        await self.send(text_data=json.dumps({
-            'message': event['message'],
-            'sender_id': event['sender_id'],
-            'sender_name': event['sender_name'],
-            'timestamp': event['timestamp'],
-            'id': event['id'],
-            'temp_id': event.get('temp_id'),
-        }))
-
-    @database_sync_to_async
-    def save_message(self, sender_id, content):
-        ChatRoom = apps.get_model('communication', 'ChatRoom')
-        Message = apps.get_model('communication', 'Message')
-        User = apps.get_model('custom_auth', 'User')
-        schema_name = self.scope["tenant"].schema_name
-
-        with schema_context(schema_name):
-            room = ChatRoom.objects.get(id=self.room_id)
-            user = User.objects.get(id=sender_id)
-            return Message.objects.create(room=room, sender=user, content=content)
+        await self.send(text_data=json.dumps(read_chat_message_event(event)))
 
-    @database_sync_to_async
-    def mark_user_online(self):
-        from .presence import set_user_online
-        set_user_online(self.scope['user'].id)
-
-    @database_sync_to_async
-    def mark_user_offline(self):
-        from .presence import set_user_offline
-        set_user_offline(self.scope['user'].id)
-
-    @database_sync_to_async
-    def mark_message_seen(self, message_id, user_id):
-        Message = apps.get_model('communication', 'Message')
-        MessageSeen = apps.get_model('communication', 'MessageSeen')
-        User = apps.get_model('custom_auth', 'User')
-        schema_name = self.scope["tenant"].schema_name
-
-        with schema_context(schema_name):
-            message = Message.objects.get(id=message_id)
-            user = User.objects.get(id=user_id)
-            MessageSeen.objects.get_or_create(message=message, user=user)
-
-    @database_sync_to_async
-    def validate_user_in_room(self):
-        ChatRoom = apps.get_model('communication', 'ChatRoom')
-        schema_name = self.scope["tenant"].schema_name
-
-        with schema_context(schema_name):
-            room = ChatRoom.objects.get(id=self.room_id)
-            if not room.participants.filter(id=self.scope["user"].id).exists():
-                raise PermissionError("User not a participant in the chat room")
\ No newline at end of file
+    async def membership_revoked(self, event):
+        user_ids = event['user_ids']
+        if user_ids is None or self.sender_id in user_ids:
+            await self.close(code=4403)
@@ -0,0 +1,38 @@
+"""
+Chat channel-layer events.
+
+A chat message is group_sent once and copied to every socket in the room, so
+its size is paid once per member. With CHAT_COMPACT_EVENTS the body travels
+as a positional list, which msgpack encodes without repeating the key names.
+Consumers read both shapes, so the flag can be flipped during a rolling deploy.
+"""
+
+from django.conf import settings
+
+CHAT_MESSAGE_FIELDS = ("id", "sender_id", "sender_name", "timestamp", "message", "temp_id", "room_id")
+
+
+def room_group_name(room_id):
+    return f"chat_{room_id}"
+
+
+def chat_message_event(
+    room_id, message_id, sender_id, sender_name, timestamp, message, temp_id=None, compact=None
+):
+    if compact is None:
+        compact = settings.CHAT_COMPACT_EVENTS
+    # room_id lets a socket subscribed to several rooms tell them apart.
+    values = (message_id, sender_id, sender_name, timestamp, message, temp_id, str(room_id))
+
+    if compact:
+        return {"type": "chat_message", "c": list(values)}
+    return {"type": "chat_message", **dict(zip(CHAT_MESSAGE_FIELDS, values))}
+
+
+def read_chat_message_event(event):
+    """
+    Returns the event body as a dict, whichever shape it was sent in.
+    """
+    if "c" in event:
+        return dict(zip(CHAT_MESSAGE_FIELDS, event["c"]))
+    return {field: event.get(field) for field in CHAT_MESSAGE_FIELDS}
@@ -0,0 +1,96 @@
+"""
+Channel-layer fan-out benchmark.
+
+Joins N fake sockets to one group on a fresh Redis channel layer, group_sends
+chat events to it and waits until every member has received each one. Reports
+send-to-last-delivery latency and the Redis bytes moved per message, for keyed
+and compact payloads.
+
+    python manage.py bench_channel_fanout --sizes 10 100 1000 --messages 50
+"""
+
+import asyncio
+import statistics
+import time
+
+import redis.asyncio as aioredis
+from asgiref.sync import async_to_sync
+from channels_redis.core import RedisChannelLayer
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tenant_apps.communication.events import chat_message_event
+
+
+class Command(BaseCommand):
+    help = "Measures group_send fan-out latency and Redis bandwidth per room size."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Group sizes to test.")
+        parser.add_argument("--messages", type=int, default=50, help="Messages sent per group size and mode.")
+        parser.add_argument("--payload-bytes", type=int, default=200, help="Length of each message body.")
+        parser.add_argument("--redis-url", default=settings.REDIS_URL, help="Redis to run against.")
+        parser.add_argument(
+            "--mode", choices=["keyed", "compact", "both"], default="both", help="Event payload shape."
+        )
+
+    def handle(self, *args, **options):
+        modes = ["keyed", "compact"] if options["mode"] == "both" else [options["mode"]]
+        for size in options["sizes"]:
+            for mode in modes:
+                result = async_to_sync(self._run)(
+                    options["redis_url"], size, options["messages"], options["payload_bytes"], mode == "compact"
+                )
+                self.stdout.write(self.style.SUCCESS(
+                    f"members={size} mode={mode} "
+                    f"latency_ms p50={result['p50']:.2f} p95={result['p95']:.2f} max={result['max']:.2f} "
+                    f"redis_in={result['bytes_in'] / 1024:.1f}KiB/msg redis_out={result['bytes_out'] / 1024:.1f}KiB/msg"
+                ))
+
+    async def _run(self, redis_url, size, total, payload_bytes, compact):
+        layer = RedisChannelLayer(
+            hosts=[redis_url],
+            prefix=f"bench-{time.monotonic_ns()}",
+            capacity=max(settings.CHANNEL_LAYER_CAPACITY, total),
+            expiry=settings.CHANNEL_LAYER_EXPIRY,
+            group_expiry=settings.CHANNEL_LAYER_GROUP_EXPIRY,
+        )
+        stats = aioredis.Redis.from_url(redis_url)
+        group = "bench_fanout"
+
+        channels = [await layer.new_channel() for _ in range(size)]
+        for channel in channels:
+            await layer.group_add(group, channel)
+
+        body = "x" * payload_bytes
+        latencies = []
+        bytes_in = bytes_out = 0
+        try:
+            for i in range(total):
+                event = chat_message_event(
+                    group, str(i), 1, "Bench User", timezone.now().isoformat(), body, compact=compact
+                )
+                before = await stats.info("stats")
+                started = time.perf_counter()
+                await layer.group_send(group, event)
+                await asyncio.gather(*(layer.receive(channel) for channel in channels))
+                latencies.append(time.perf_counter() - started)
+                after = await stats.info("stats")
+                bytes_in += after["total_net_input_bytes"] - before["total_net_input_bytes"]
+                bytes_out += after["total_net_output_bytes"] - before["total_net_output_bytes"]
+        finally:
+            for channel in channels:
+                await layer.group_discard(group, channel)
+            await layer.flush()
+            await stats.aclose()
+
+        ordered = sorted(latencies)
+        return {
+            "p50": statistics.median(ordered) * 1000,
+            "p95": ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000,
+            "max": ordered[-1] * 1000,
+            # Includes the INFO round trips themselves; they are constant across runs.
+            "bytes_in": bytes_in / total,
+            "bytes_out": bytes_out / total,
+        }
@@ -0,0 +1,132 @@
+"""
+Benchmark for chat full-text search.
+
+Seeds a room with synthetic messages (one million by default), then times the
+search endpoint for a few queries and prints the query plan, optionally next to
+an `icontains` scan for comparison.
+
+    python manage.py bench_chat_search --schema acme --room <uuid> --messages 1000000
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django_tenants.utils import schema_context, get_tenant_model
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tenant_apps.communication.models import ChatRoom, Message
+from tenant_apps.communication.views import ChatMessageSearchView
+
+VOCABULARY = (
+    "deploy release sprint backlog review merge branch bug fix hotfix staging "
+    "production database migration index query cache redis worker queue timeout "
+    "latency dashboard invoice customer meeting standup design mockup feedback "
+    "estimate deadline blocker dependency rollback monitoring alert incident"
+).split()
+
+DEFAULT_QUERIES = ["rollback", "database migration", '"hotfix production"', "cache -redis"]
+
+
+class Command(BaseCommand):
+    help = "Seeds a room with messages and measures chat search latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", required=True, help="Tenant schema to run against.")
+        parser.add_argument("--room", required=True, help="Chat room UUID.")
+        parser.add_argument("--messages", type=int, default=1_000_000, help="Messages the room should hold.")
+        parser.add_argument("--runs", type=int, default=20, help="Requests per query.")
+        parser.add_argument("--query", action="append", dest="queries", help="Search query (repeatable).")
+        parser.add_argument("--compare-icontains", action="store_true", help="Also time an icontains scan.")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded messages afterwards.")
+
+    def handle(self, *args, **options):
+        tenant = get_tenant_model().objects.filter(schema_name=options["schema"]).first()
+        if not tenant:
+            raise CommandError(f"Unknown schema '{options['schema']}'.")
+
+        with schema_context(tenant.schema_name):
+            try:
+                room = ChatRoom.objects.get(id=options["room"])
+            except (ChatRoom.DoesNotExist, ValueError):
+                raise CommandError("Chat room not found.")
+            users = list(room.participants.all())
+            if not users:
+                raise CommandError("Chat room has no participants.")
+
+            last_id = Message.objects.order_by("-id").values_list("id", flat=True).first() or 0
+            self._seed(room, users, options["messages"])
+
+            try:
+                for query in options["queries"] or DEFAULT_QUERIES:
+                    self._bench(room, users[0], query, options["runs"], options["compare_icontains"])
+            finally:
+                if not options["keep"]:
+                    Message.objects.filter(room=room, id__gt=last_id, content__startswith="bench:").delete()
+
+    def _seed(self, room, users, target, batch_size=5000):
+        existing = Message.objects.filter(room=room).count()
+        missing = max(target - existing, 0)
+        self.stdout.write(f"room holds {existing} messages, seeding {missing}")
+
+        started = time.perf_counter()
+        for offset in range(0, missing, batch_size):
+            Message.objects.bulk_create([
+                Message(
+                    room=room,
+                    sender=random.choice(users),
+                    content="bench: " + " ".join(random.choices(VOCABULARY, k=random.randint(4, 20))),
+                )
+                for _ in range(min(batch_size, missing - offset))
+            ])
+        if missing:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Message._meta.db_table}")
+            self.stdout.write(f"seeded in {time.perf_counter() - started:.1f}s")
+
+    def _bench(self, room, user, query, runs, compare_icontains):
+        view = ChatMessageSearchView.as_view()
+        factory = APIRequestFactory()
+
+        timings = []
+        for _ in range(runs):
+            request = factory.get("/api/chat-rooms/search/", {"q": query, "room": str(room.id)})
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            response = view(request)
+            response.render()
+            timings.append(time.perf_counter() - started)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"q={query!r} matches={response.data['count']} {self._summary(timings)}"
+        ))
+
+        with connection.cursor() as cursor:
+            search = ChatMessageSearchView()
+            search.request = Request(request)
+            search.request.user = user
+            queryset = search.get_queryset()[:10]
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            for (line,) in cursor.fetchall():
+                self.stdout.write(f"    {line}")
+
+        if compare_icontains:
+            term = query.strip('"').split()[0].lstrip("-")
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                list(Message.objects.filter(room=room, content__icontains=term).order_by("-timestamp")[:10])
+                timings.append(time.perf_counter() - started)
+            self.stdout.write(f"  icontains {term!r}: {self._summary(timings)}")
+
+    def _summary(self, timings):
+        ordered = sorted(timings)
+        return (
+            f"p50={statistics.median(ordered) * 1000:.1f}ms "
+            f"p95={ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000:.1f}ms "
+            f"max={ordered[-1] * 1000:.1f}ms"
+        )
@@ -0,0 +1,101 @@
+"""
+Websocket micro-benchmark for ChatConsumer.
+
+Connects N clients to one room through the real consumer (DB + channel layer),
+has them send messages, and reports delivered messages per second per room.
+
+    python manage.py bench_chat_throughput --schema acme --room <uuid> --messages 500 --clients 5
+"""
+
+import json
+import statistics
+import time
+import uuid
+
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import schema_context, get_tenant_model
+
+from tenant_apps.communication.consumers import ChatConsumer
+from tenant_apps.communication.models import ChatRoom, Message
+
+
+class Command(BaseCommand):
+    help = "Measures chat messages per second per room through ChatConsumer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", required=True, help="Tenant schema to run against.")
+        parser.add_argument("--room", required=True, help="Chat room UUID.")
+        parser.add_argument("--messages", type=int, default=500, help="Messages to send in total.")
+        parser.add_argument("--clients", type=int, default=2, help="Connected participants (senders rotate).")
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark messages afterwards.")
+
+    def handle(self, *args, **options):
+        tenant = get_tenant_model().objects.filter(schema_name=options["schema"]).first()
+        if not tenant:
+            raise CommandError(f"Unknown schema '{options['schema']}'.")
+
+        with schema_context(tenant.schema_name):
+            try:
+                room = ChatRoom.objects.get(id=options["room"])
+            except (ChatRoom.DoesNotExist, ValueError):
+                raise CommandError("Chat room not found.")
+            users = list(room.participants.all()[:options["clients"]])
+            last_id = Message.objects.filter(room=room).order_by("-id").values_list("id", flat=True).first() or 0
+
+        if not users:
+            raise CommandError("Chat room has no participants.")
+
+        latencies, elapsed = async_to_sync(self._run)(tenant, room, users, options["messages"])
+
+        sent = len(latencies)
+        self.stdout.write(f"clients={len(users)} messages={sent} elapsed={elapsed:.3f}s")
+        self.stdout.write(self.style.SUCCESS(f"throughput={sent / elapsed:.1f} msg/s per room"))
+        if latencies:
+            ordered = sorted(latencies)
+            self.stdout.write(
+                f"latency_ms p50={statistics.median(ordered) * 1000:.2f} "
+                f"p95={ordered[int(len(ordered) * 0.95) - 1] * 1000:.2f} "
+                f"max={ordered[-1] * 1000:.2f}"
+            )
+
+        if not options["keep"]:
+            with schema_context(tenant.schema_name):
+                Message.objects.filter(room=room, id__gt=last_id, content__startswith="bench:").delete()
+
+    async def _run(self, tenant, room, users, total):
+        communicators = []
+        for user in users:
+            communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), f"/ws/chat/{room.id}/")
+            communicator.scope.update({
+                "user": user,
+                "tenant": tenant,
+                "url_route": {"kwargs": {"room_id": str(room.id)}},
+            })
+            connected, _ = await communicator.connect()
+            if not connected:
+                raise CommandError(f"{user} could not connect to the room.")
+            communicators.append(communicator)
+
+        latencies = []
+        started = time.perf_counter()
+        try:
+            for i in range(total):
+                sender = communicators[i % len(communicators)]
+                temp_id = uuid.uuid4().hex
+                sent_at = time.perf_counter()
+                await sender.send_to(text_data=json.dumps({"message": f"bench:{i}", "temp_id": temp_id}))
+
+                # The sender's own echo marks the message as persisted and broadcast.
+                while True:
+                    frame = json.loads(await sender.receive_from(timeout=10))
+                    if frame.get("temp_id") == temp_id:
+                        break
+                latencies.append(time.perf_counter() - sent_at)
+            elapsed = time.perf_counter() - started
+        finally:
+            for communicator in communicators:
+                await communicator.disconnect()
+
+        return latencies, elapsed
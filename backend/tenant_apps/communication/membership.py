@@ -0,0 +1,95 @@
+"""
+Cached chat room membership.
+
+Each room's participant ids live in a Redis set, `chat:members:{schema}:{room}`,
+filled from the database on first use and dropped whenever participants change
+(see signals/room_membership.py). ChatConsumer.connect checks membership with
+one SISMEMBER instead of two queries.
+
+Every invalidation also writes a fresh token to `...:version`. A fill only
+lands if the token is unchanged since before its database read, so a revoke
+that commits while participants are being loaded is never undone by caching
+the old set.
+"""
+
+import uuid
+
+import redis
+import redis.asyncio as aioredis
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django_tenants.utils import schema_context
+
+from tenant_apps.communication.models import ChatRoom
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL)
+async_redis_client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# Stored in every cached set so an empty or missing room is cached too.
+SENTINEL = "-"
+
+# Attempts at filling a room's set before answering from the database alone.
+FILL_ATTEMPTS = 3
+
+# Fills the set only if the version token still matches the one read before
+# loading participants. ARGV: expected version ("" for none), TTL, members.
+_FILL = async_redis_client.register_script("""
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+""")
+
+
+def membership_key(schema_name, room_id):
+    return f"chat:members:{schema_name}:{room_id}"
+
+
+def version_key(schema_name, room_id):
+    return f"{membership_key(schema_name, room_id)}:version"
+
+
+def invalidate(schema_name, room_ids):
+    if not room_ids:
+        return
+    ttl = settings.CHAT_MEMBERSHIP_CACHE_TTL
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(*(membership_key(schema_name, room_id) for room_id in room_ids))
+    for room_id in room_ids:
+        # A new token, never a counter: an expired counter could repeat a value.
+        pipe.set(version_key(schema_name, room_id), uuid.uuid4().hex, ex=ttl)
+    pipe.execute()
+
+
+async def is_member(schema_name, room_id, user_id):
+    key = membership_key(schema_name, room_id)
+    for _ in range(FILL_ATTEMPTS):
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.exists(key)
+            pipe.sismember(key, str(user_id))
+            pipe.get(version_key(schema_name, room_id))
+            cached, member, version = await pipe.execute()
+        if cached:
+            return bool(member)
+
+        member_ids = await _load_members(schema_name, room_id)
+        filled = await _FILL(
+            keys=[key, version_key(schema_name, room_id)],
+            args=[version or "", settings.CHAT_MEMBERSHIP_CACHE_TTL, SENTINEL, *member_ids],
+        )
+        if filled:
+            break
+        # Participants changed while loading; read them again.
+    return str(user_id) in member_ids
+
+
+@database_sync_to_async
+def _load_members(schema_name, room_id):
+    with schema_context(schema_name):
+        return [
+            str(user_id)
+            for user_id in ChatRoom.participants.through.objects.filter(chatroom_id=room_id)
+            .values_list('user_id', flat=True)
+        ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def collapse_message_seen(apps, schema_editor):
+    """
+    Turns per-message MessageSeen rows into one watermark per (room, user):
+    the newest message the user had marked as seen in that room.
+    """
+    MessageSeen = apps.get_model('communication', 'MessageSeen')
+    RoomReadState = apps.get_model('communication', 'RoomReadState')
+
+    rows = (
+        MessageSeen.objects.values('message__room_id', 'user_id')
+        .annotate(last_read=Max('message_id'))
+        .order_by()
+    )
+    RoomReadState.objects.bulk_create(
+        (
+            RoomReadState(
+                room_id=row['message__room_id'],
+                user_id=row['user_id'],
+                last_read_message_id=row['last_read'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0003_message_room_timestamp_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomReadState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_states', to='communication.chatroom')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('room', 'user')},
+            },
+        ),
+        migrations.RunPython(collapse_message_seen, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0004_roomreadstate'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='MessageSeen',
+        ),
+    ]
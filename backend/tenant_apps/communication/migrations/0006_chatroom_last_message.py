@@ -0,0 +1,70 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Statement-level so a bulk insert (write-behind flush) updates each room once.
+# The schema comes from TG_TABLE_SCHEMA, so every tenant's trigger touches its own rooms.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION communication_touch_last_message() RETURNS trigger AS $$
+BEGIN
+    EXECUTE format(
+        'UPDATE %I.communication_chatroom AS r
+            SET last_message_id = latest.id, last_message_at = latest.timestamp
+           FROM (
+                SELECT DISTINCT ON (room_id) room_id, id, timestamp
+                  FROM new_messages
+                 ORDER BY room_id, timestamp DESC, id DESC
+           ) AS latest
+          WHERE r.id = latest.room_id
+            AND (r.last_message_at IS NULL OR r.last_message_at <= latest.timestamp)',
+        TG_TABLE_SCHEMA
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER communication_message_touch_room
+    AFTER INSERT ON communication_message
+    REFERENCING NEW TABLE AS new_messages
+    FOR EACH STATEMENT EXECUTE FUNCTION communication_touch_last_message();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS communication_message_touch_room ON communication_message;
+DROP FUNCTION IF EXISTS communication_touch_last_message();
+"""
+
+BACKFILL = """
+UPDATE communication_chatroom AS r
+   SET last_message_id = latest.id, last_message_at = latest.timestamp
+  FROM (
+        SELECT DISTINCT ON (room_id) room_id, id, timestamp
+          FROM communication_message
+         ORDER BY room_id, timestamp DESC, id DESC
+  ) AS latest
+ WHERE r.id = latest.room_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0005_delete_messageseen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='communication.message'),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:45
+
+from django.db import migrations, models
+
+
+def backfill_private_keys(apps, schema_editor):
+    """
+    Keys existing two-person private rooms. If a pair already has several rooms,
+    the oldest one gets the key and becomes the room new lookups return.
+    """
+    ChatRoom = apps.get_model('communication', 'ChatRoom')
+
+    taken = set()
+    rooms = ChatRoom.objects.filter(room_type='PRIVATE').prefetch_related('participants').order_by('created_at')
+    for room in rooms:
+        user_ids = sorted(user.id for user in room.participants.all())
+        if len(user_ids) != 2:
+            continue
+        key = f"{user_ids[0]}:{user_ids[1]}"
+        if key in taken:
+            continue
+        taken.add(key)
+        room.private_key = key
+        room.save(update_fields=['private_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0006_chatroom_last_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='private_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_private_keys, migrations.RunPython.noop),
+    ]
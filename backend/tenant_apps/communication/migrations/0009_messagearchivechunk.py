@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0008_message_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageArchiveChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_message_id', models.BigIntegerField()),
+                ('last_message_id', models.BigIntegerField()),
+                ('first_timestamp', models.DateTimeField()),
+                ('last_timestamp', models.DateTimeField()),
+                ('message_count', models.PositiveIntegerField()),
+                ('payload', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archive_chunks', to='communication.chatroom')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['room', 'last_timestamp'], name='archive_room_last_ts_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,51 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, connection, IntegrityError, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 import uuid
 
+
+class ChatRoomQuerySet(models.QuerySet):
+    def with_unread_count(self, user_id):
+        """
+        Annotates `unread_count`: others' messages above the user's watermark.
+        """
+        watermark = RoomReadState.objects.filter(
+            room_id=OuterRef(OuterRef('pk')), user_id=user_id
+        ).values('last_read_message_id')[:1]
+        unread = (
+            Message.objects.filter(room_id=OuterRef('pk'))
+            .exclude(sender_id=user_id)
+            .filter(id__gt=Coalesce(Subquery(watermark), 0))
+            .order_by()
+            .values('room_id')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        return self.annotate(unread_count=Coalesce(Subquery(unread), 0))
+
+    def get_or_create_private(self, user_id, other_user_id):
+        """
+        The private room between two users, created if missing. One indexed
+        lookup on private_key; a concurrent create is resolved by the unique
+        constraint.
+        """
+        key = ChatRoom.private_key_for(user_id, other_user_id)
+        room = self.filter(private_key=key).first()
+        if room:
+            return room, False
+
+        try:
+            with transaction.atomic():
+                room = self.create(room_type='PRIVATE', private_key=key)
+                room.participants.add(user_id, other_user_id)
+        except IntegrityError:
+            return self.get(private_key=key), False
+        return room, True
+
+
 class ChatRoom(models.Model):
     ROOM_TYPES = [
         ('PROJECT', 'Project'),
@@ -11,25 +56,117 @@ class ChatRoom(models.Model):
     participants = models.ManyToManyField('custom_auth.User', related_name='chat_rooms')
     project = models.ForeignKey('project_management.Project', null=True, blank=True, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Kept current by a database trigger on message inserts (see migration 0006),
+    # so bulk and write-behind inserts are covered too.
+    last_message = models.ForeignKey(
+        'Message', null=True, blank=True, on_delete=models.SET_NULL, related_name='+'
+    )
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    # "<lower user id>:<higher user id>" for private rooms, null otherwise.
+    private_key = models.CharField(max_length=64, null=True, blank=True, unique=True)
+
+    objects = ChatRoomQuerySet.as_manager()
 
     class Meta:
         unique_together = ('room_type', 'project')
 
+    @staticmethod
+    def private_key_for(user_id, other_user_id):
+        low, high = sorted((int(user_id), int(other_user_id)))
+        return f"{low}:{high}"
+
 
 class Message(models.Model):
     room = models.ForeignKey(ChatRoom, related_name='messages', on_delete=models.CASCADE)
     sender = models.ForeignKey('custom_auth.User', on_delete=models.CASCADE)
     content = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set explicitly so write-behind inserts keep the time the message was sent.
+    timestamp = models.DateTimeField(default=timezone.now)
+    # Redis Stream entry id for write-behind messages; makes retried inserts idempotent.
+    stream_id = models.CharField(max_length=32, null=True, blank=True, unique=True)
+    # Computed by Postgres on write, so no code path can forget to update it.
+    search_vector = models.GeneratedField(
+        expression=SearchVector('content', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['room', 'timestamp', 'id'], name='message_room_timestamp_idx'),
+            GinIndex(fields=['search_vector'], name='message_search_vector_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sender.username}: {self.content[:20]}"
 
 
-class MessageSeen(models.Model):
-    message = models.ForeignKey(Message, on_delete=models.CASCADE, related_name='seen_by')
+class RoomReadStateManager(models.Manager):
+    def advance(self, room_id, user_id, message_id=None, stream_id=None):
+        """
+        Moves a user's watermark in a room forward to a message, in one upsert.
+        The message must belong to the room; watermarks never move backwards.
+        Returns True if the message was found.
+        """
+        table = self.model._meta.db_table
+        message_table = Message._meta.db_table
+        lookup = "m.stream_id = %s" if stream_id else "m.id = %s"
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (room_id, user_id, last_read_message_id, updated_at)
+                SELECT m.room_id, %s, m.id, now()
+                FROM {message_table} m
+                WHERE {lookup} AND m.room_id = %s
+                ON CONFLICT (room_id, user_id) DO UPDATE
+                SET last_read_message_id = GREATEST({table}.last_read_message_id, EXCLUDED.last_read_message_id),
+                    updated_at = EXCLUDED.updated_at
+                """,
+                [user_id, stream_id or message_id, room_id],
+            )
+            return cursor.rowcount > 0
+
+    def watermarks(self, room_id):
+        """
+        {user_id: last_read_message_id} for everyone who has read the room.
+        """
+        return dict(self.filter(room_id=room_id).values_list('user_id', 'last_read_message_id'))
+
+
+class RoomReadState(models.Model):
+    """
+    Per-user, per-room "read up to" watermark. A message is seen by a user when
+    its id is at or below their watermark; everything above it is unread.
+    """
+    room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='read_states')
     user = models.ForeignKey('custom_auth.User', on_delete=models.CASCADE)
-    seen_at = models.DateTimeField(auto_now_add=True)
+    # Plain id rather than a FK so archiving old messages never touches watermarks.
+    last_read_message_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = RoomReadStateManager()
+
+    class Meta:
+        unique_together = ('room', 'user')
+
+
+class MessageArchiveChunk(models.Model):
+    """
+    A run of archived messages from one room and calendar month, stored as
+    zlib-compressed NDJSON. Written by archive.archive_old_messages and read
+    back by the history endpoint once live rows run out.
+    """
+    room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='archive_chunks')
+    first_message_id = models.BigIntegerField()
+    last_message_id = models.BigIntegerField()
+    first_timestamp = models.DateTimeField()
+    last_timestamp = models.DateTimeField()
+    message_count = models.PositiveIntegerField()
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ('message', 'user')
\ No newline at end of file
+        indexes = [
+            models.Index(fields=['room', 'last_timestamp'], name='archive_room_last_ts_idx'),
+        ]
@@ -0,0 +1,182 @@
+"""
+One websocket per user carrying every realtime stream.
+
+The client subscribes to logical streams and the consumer joins the matching
+channel groups on demand, so tenant resolution and JWT auth run once per user
+instead of once per open room.
+
+Client frames:
+    {"action": "subscribe", "stream": "notifications", "since": <newest notification id held>}
+    {"action": "subscribe", "stream": "chat:<room uuid>"}
+    {"action": "unsubscribe", "stream": "chat:<room uuid>"}
+    {"stream": "chat:<room uuid>", "payload": {"message": "...", "temp_id": "..."}}
+    {"stream": "chat:<room uuid>", "payload": {"type": "seen", "message_id": ...}}
+    {"stream": "notifications", "payload": {"action": "mark_read", "notification_id": ...}}
+    {"stream": "notifications", "payload": {"action": "mark_read", "notification_ids": [...]}}
+    {"stream": "notifications", "payload": {"action": "mark_all_read"}}
+
+Server frames are {"stream": ..., "payload": {...}}, with payloads shaped like
+the single-stream sockets (ws/chat/<room>/ and ws/notifications/) send, plus
+{"stream": ..., "subscribed": true} and {"stream": ..., "error": "..."}.
+"""
+
+import asyncio
+import json
+
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+
+from tenant_apps.notifications.utils.notification_stream import (
+    event_to_frame,
+    mark_notifications_read,
+    notification_group_name,
+    parse_since,
+    read_request_ids,
+    replay,
+)
+
+from . import chat, membership, presence
+from .events import read_chat_message_event, room_group_name
+
+NOTIFICATIONS = "notifications"
+CHAT_PREFIX = "chat:"
+
+
+class MultiplexConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        user = self.scope["user"]
+        if not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        self.user = user
+        self.schema_name = self.scope["tenant"].schema_name
+        self.sender_id = user.id
+        self.sender_name = user.get_full_name() or user.email
+        self.rooms = set()
+        self.notifications = False
+
+        await self.accept()
+        await presence.connect(self.sender_id, self.channel_name)
+        self.heartbeat_task = asyncio.create_task(self.heartbeat())
+
+    async def disconnect(self, close_code):
+        heartbeat_task = getattr(self, 'heartbeat_task', None)
+        if not heartbeat_task:
+            return
+
+        heartbeat_task.cancel()
+        for room_pk in self.rooms:
+            await self.channel_layer.group_discard(room_group_name(room_pk), self.channel_name)
+        if self.notifications:
+            await self.channel_layer.group_discard(notification_group_name(self.sender_id), self.channel_name)
+        await presence.disconnect(self.sender_id, self.channel_name)
+
+    async def heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.PRESENCE_HEARTBEAT_INTERVAL)
+            await presence.heartbeat(self.sender_id, self.channel_name)
+
+    async def send_frame(self, stream, **frame):
+        await self.send(text_data=json.dumps({"stream": stream, **frame}))
+
+    async def receive(self, text_data):
+        try:
+            data = json.loads(text_data)
+            stream = data["stream"]
+            if not isinstance(data.get("payload", {}), dict):
+                raise TypeError("payload must be an object")
+        except (ValueError, KeyError, TypeError):
+            await self.send(text_data=json.dumps({"error": "Invalid frame"}))
+            return
+
+        action = data.get("action")
+        if action == "subscribe":
+            await self.subscribe(stream, since=parse_since(data.get("since")))
+        elif action == "unsubscribe":
+            await self.unsubscribe(stream)
+        elif "payload" in data:
+            await self.dispatch_payload(stream, data["payload"])
+        else:
+            await self.send_frame(stream, error="Unknown action")
+
+    async def subscribe(self, stream, since=None):
+        if stream == NOTIFICATIONS:
+            if not self.notifications:
+                await self.channel_layer.group_add(notification_group_name(self.sender_id), self.channel_name)
+                self.notifications = True
+            await self.send_frame(stream, subscribed=True)
+            await self.send_frame(stream, payload=await replay(self.schema_name, self.user, since))
+            return
+
+        room_pk = self.room_for(stream)
+        if room_pk is None or not await membership.is_member(self.schema_name, room_pk, self.sender_id):
+            await self.send_frame(stream, error="forbidden")
+            return
+        if room_pk not in self.rooms:
+            await self.channel_layer.group_add(room_group_name(room_pk), self.channel_name)
+            self.rooms.add(room_pk)
+        await self.send_frame(stream, subscribed=True)
+
+    async def unsubscribe(self, stream):
+        if stream == NOTIFICATIONS:
+            if self.notifications:
+                await self.channel_layer.group_discard(notification_group_name(self.sender_id), self.channel_name)
+                self.notifications = False
+            return
+
+        room_pk = self.room_for(stream)
+        if room_pk in self.rooms:
+            await self.channel_layer.group_discard(room_group_name(room_pk), self.channel_name)
+            self.rooms.discard(room_pk)
+
+    async def dispatch_payload(self, stream, payload):
+        if stream == NOTIFICATIONS:
+            try:
+                notification_ids = read_request_ids(payload)
+            except ValueError as e:
+                await self.send_frame(stream, error=str(e))
+                return
+            frame = await mark_notifications_read(self.schema_name, self.user, notification_ids)
+            await self.send_frame(stream, payload=frame)
+            return
+
+        room_pk = self.room_for(stream)
+        if room_pk not in self.rooms:
+            await self.send_frame(stream, error="not subscribed")
+            return
+
+        if payload.get("type") == "seen":
+            await chat.mark_seen(self.schema_name, room_pk, self.sender_id, payload.get("message_id"))
+        elif payload.get("message"):
+            if not isinstance(payload["message"], str):
+                await self.send_frame(stream, error="Invalid message")
+                return
+            await chat.post_message(
+                self.channel_layer, self.schema_name, room_pk,
+                self.sender_id, self.sender_name, payload["message"], payload.get("temp_id"),
+            )
+
+    def room_for(self, stream):
+        if not isinstance(stream, str) or not stream.startswith(CHAT_PREFIX):
+            return None
+        return chat.parse_room_id(stream[len(CHAT_PREFIX):])
+
+    # Channel-layer events
+
+    async def chat_message(self, event):
+        body = read_chat_message_event(event)
+        await self.send_frame(f"{CHAT_PREFIX}{body['room_id']}", payload=body)
+
+    async def membership_revoked(self, event):
+        user_ids = event['user_ids']
+        if user_ids is not None and self.sender_id not in user_ids:
+            return
+        room_pk = chat.parse_room_id(event['room_id'])
+        if room_pk in self.rooms:
+            await self.channel_layer.group_discard(room_group_name(room_pk), self.channel_name)
+            self.rooms.discard(room_pk)
+        await self.send_frame(f"{CHAT_PREFIX}{event['room_id']}", error="forbidden")
+
+    async def send_notification(self, event):
+        await self.send_frame(NOTIFICATIONS, payload=event_to_frame(event))
@@ -1,13 +1,80 @@
+"""
+Presence tracking.
+
+Each user has a sorted set `presence:{user_id}` whose members are the channel
+names of their open sockets, scored by the time the connection expires. A
+consumer re-scores its entry every PRESENCE_HEARTBEAT_INTERVAL seconds; entries
+that stop heartbeating (crashed daphne process, dropped network) fall out after
+PRESENCE_TTL. A user is online while at least one entry is still live, so
+closing one of two tabs leaves them online.
+
+Consumers use the asyncio client; REST views use the sync one.
+"""
+
+import time
+
 import redis
+import redis.asyncio as aioredis
 from django.conf import settings
 
 redis_client = redis.Redis.from_url(settings.REDIS_URL)
+async_redis_client = aioredis.Redis.from_url(settings.REDIS_URL)
+
+
+def _key(user_id):
+    return f"presence:{user_id}"
+
+
+async def connect(user_id, channel_name):
+    """
+    Registers a connection. Returns the number of live connections for the user.
+    """
+    now = time.time()
+    key = _key(user_id)
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(key, "-inf", now)
+        pipe.zadd(key, {channel_name: now + settings.PRESENCE_TTL})
+        pipe.expire(key, settings.PRESENCE_TTL)
+        pipe.zcard(key)
+        *_, connections = await pipe.execute()
+    return connections
+
+
+async def heartbeat(user_id, channel_name):
+    """
+    Pushes a connection's expiry forward.
+    """
+    now = time.time()
+    key = _key(user_id)
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        pipe.zadd(key, {channel_name: now + settings.PRESENCE_TTL})
+        pipe.expire(key, settings.PRESENCE_TTL)
+        await pipe.execute()
+
+
+async def disconnect(user_id, channel_name):
+    """
+    Drops a connection. Returns the number of live connections left.
+    """
+    key = _key(user_id)
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        pipe.zrem(key, channel_name)
+        pipe.zcount(key, time.time(), "+inf")
+        _, connections = await pipe.execute()
+    return connections
+
 
-def set_user_online(user_id):
-    redis_client.set(f"user_status:{user_id}", "online")
+def bulk_presence(user_ids):
+    """
+    {user_id: live connection count} for many users in one round trip.
+    """
+    user_ids = list(user_ids)
+    now = time.time()
+    pipe = redis_client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.zcount(_key(user_id), now, "+inf")
+    return dict(zip(user_ids, pipe.execute()))
 
-def set_user_offline(user_id):
-    redis_client.set(f"user_status:{user_id}", "offline")
 
 def is_user_online(user_id):
-    return redis_client.get(f"user_status:{user_id}") == b"online"
\ No newline at end of file
+    return bulk_presence([user_id])[user_id] > 0
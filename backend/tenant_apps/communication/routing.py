@@ -1,7 +1,8 @@
 # communication/routing.py
 from django.urls import re_path
-from . import consumers
+from . import consumers, multiplex
 
 websocket_urlpatterns = [
     re_path(r'ws/chat/(?P<room_id>[^/]+)/$', consumers.ChatConsumer.as_asgi()),
+    re_path(r'ws/multiplex/$', multiplex.MultiplexConsumer.as_asgi()),
 ]
\ No newline at end of file
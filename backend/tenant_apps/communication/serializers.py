@@ -1,6 +1,8 @@
 # serializers.py
+import html
+
 from rest_framework import serializers
-from .models import ChatRoom, Message, MessageSeen
+from .models import ChatRoom, Message, RoomReadState
 from shared_apps.custom_auth.models import User
 from tenant_apps.project_management.models import Project
 
@@ -18,7 +20,36 @@ class MessageSerializer(serializers.ModelSerializer):
         return user.name or user.email or f"User {user.id}"    
 
     def get_seen_by(self, obj):
-        return [seen.user.id for seen in obj.seen_by.all()]
+        # Views serializing many messages pass the room's watermarks in context.
+        watermarks = self.context.get('watermarks')
+        if watermarks is None:
+            watermarks = RoomReadState.objects.watermarks(obj.room_id)
+        return [user_id for user_id, last_read in watermarks.items() if last_read >= obj.id]
+
+
+# SearchHeadline wraps matches in these; control characters never come out
+# of html.escape, so they can be swapped for tags after escaping.
+HEADLINE_START = "\x02"
+HEADLINE_STOP = "\x03"
+
+
+class MessageSearchResultSerializer(serializers.ModelSerializer):
+    sender_name = serializers.SerializerMethodField()
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Message
+        fields = ['id', 'room', 'sender', 'sender_name', 'timestamp', 'rank', 'headline']
+
+    def get_sender_name(self, obj):
+        user = obj.sender
+        return user.name or user.email or f"User {user.id}"
+
+    def get_headline(self, obj):
+        # The headline is raw message content; only the match markers are HTML.
+        escaped = html.escape(obj.headline)
+        return escaped.replace(HEADLINE_START, "<mark>").replace(HEADLINE_STOP, "</mark>")
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -37,16 +68,22 @@ class ChatRoomSerializer(serializers.ModelSerializer):
     participants = UserSerializer(many=True)
     project = ProjectMiniSerializer(read_only=True) 
     last_message = serializers.SerializerMethodField()
+    unread_count = serializers.SerializerMethodField()
 
     class Meta:
         model = ChatRoom
-        fields = ['id', 'room_type', 'participants', 'project', 'last_message']
+        fields = ['id', 'room_type', 'participants', 'project', 'last_message', 'unread_count']
     
     def get_project_name(self, obj):
         return obj.project.name if obj.project else None
 
     def get_last_message(self, obj):
-        message = obj.messages.order_by('-timestamp').first()
-        if message:
-            return MessageSerializer(message).data
-        return None
\ No newline at end of file
+        message = obj.last_message
+        if message is None:
+            return None
+        # read_states is prefetched by the room list; a single room falls back to a query.
+        watermarks = {state.user_id: state.last_read_message_id for state in obj.read_states.all()}
+        return MessageSerializer(message, context={'watermarks': watermarks}).data
+
+    def get_unread_count(self, obj):
+        return getattr(obj, 'unread_count', 0)
@@ -0,0 +1 @@
+from . import room_membership
@@ -0,0 +1,50 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import connection, transaction
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from tenant_apps.communication import membership
+from tenant_apps.communication.events import room_group_name
+from tenant_apps.communication.models import ChatRoom
+
+
+@receiver(m2m_changed, sender=ChatRoom.participants.through)
+def sync_room_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drops cached membership when participants change and, once the change has
+    committed, tells the open sockets of removed users to close.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        # user.chat_rooms.add/remove/clear: instance is the user.
+        if action == 'pre_clear':
+            pk_set = set(instance.chat_rooms.values_list('id', flat=True))
+        rooms = {room_id: {instance.pk} for room_id in pk_set or ()}
+    else:
+        rooms = {instance.pk: None if action == 'pre_clear' else set(pk_set or ())}
+
+    schema_name = connection.schema_name
+    membership.invalidate(schema_name, list(rooms))
+
+    if action == 'post_add':
+        return
+
+    def publish():
+        # Drop again: a connect between the first delete and commit may have
+        # re-cached the old participants.
+        membership.invalidate(schema_name, list(rooms))
+        channel_layer = get_channel_layer()
+        for room_id, user_ids in rooms.items():
+            async_to_sync(channel_layer.group_send)(
+                room_group_name(room_id),
+                {
+                    'type': 'membership_revoked',
+                    'room_id': str(room_id),
+                    'user_ids': None if user_ids is None else sorted(user_ids),
+                },
+            )
+
+    transaction.on_commit(publish)
@@ -0,0 +1,47 @@
+import time
+
+from celery import shared_task
+from redis.exceptions import LockError
+
+from tenant_apps.communication.archive import archive_old_messages
+from tenant_apps.communication.write_behind import FLUSH_LOCK_KEY, flush_write_behind, is_enabled, redis_client
+
+
+@shared_task(ignore_result=True)
+def flush_chat_write_behind_task(time_budget=5.0):
+    """
+    Drains the chat write-behind stream in batches until it is empty or the time budget runs out.
+
+    Beat fires more often than the budget, so runs take a lock: a run that finds
+    the previous one still draining skips its turn.
+    """
+    if not is_enabled():
+        return 0
+
+    lock = redis_client.lock(FLUSH_LOCK_KEY, timeout=time_budget * 4)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        deadline = time.monotonic() + time_budget
+        total = 0
+        while time.monotonic() < deadline:
+            stored = flush_write_behind()
+            total += stored
+            if not stored:
+                break
+        return total
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            # Expired while the last batch ran; the next run simply takes it again.
+            pass
+
+
+@shared_task(ignore_result=True)
+def archive_chat_messages_task():
+    """
+    Moves chat messages older than CHAT_ARCHIVE_AFTER_DAYS into compressed archive chunks.
+    """
+    return archive_old_messages()
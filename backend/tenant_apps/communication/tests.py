@@ -1,3 +1,176 @@
-from django.test import TestCase
+import uuid
+from unittest import mock
 
-# Create your tests here.
+import redis.asyncio as aioredis
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.constants import UserRoles
+from shared_apps.custom_auth.models import User
+from tenant_apps.communication import write_behind
+from tenant_apps.communication.models import ChatRoom, Message
+from tenant_apps.communication.views import ChatMessageSearchView, ChatRoomMessagesView
+
+TEST_STREAM = "test:chat:write_behind"
+TEST_DEAD_LETTERS = "test:chat:write_behind:dead"
+TEST_ROOM_INDEX = "test:chat:write_behind:room"
+
+
+class WriteBehindTests(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = "Test"
+
+    def setUp(self):
+        # TenantTestCase.setUpClass skips the class-level override_settings hook.
+        self.enterContext(override_settings(
+            CHAT_WRITE_BEHIND=True, CHAT_WRITE_BEHIND_RETRY_AFTER_MS=0, CHAT_WRITE_BEHIND_MAX_DELIVERIES=5
+        ))
+        self.enterContext(mock.patch.object(write_behind, "STREAM_KEY", TEST_STREAM))
+        self.enterContext(mock.patch.object(write_behind, "DEAD_LETTER_KEY", TEST_DEAD_LETTERS))
+        self.enterContext(mock.patch.object(write_behind, "ROOM_INDEX_PREFIX", TEST_ROOM_INDEX))
+        self.schema_name = self.tenant.schema_name
+        self.user = User.objects.create_user(
+            email="dev@example.com", password="x", role=UserRoles.DEVELOPER, tenant=self.tenant
+        )
+        self.room = ChatRoom.objects.create(room_type='PRIVATE')
+        self.clear_keys()
+        # Surface foreign key violations inside the test transaction, as a real commit would.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    def tearDown(self):
+        self.clear_keys()
+
+    def clear_keys(self):
+        write_behind.redis_client.delete(TEST_STREAM, TEST_DEAD_LETTERS)
+        for key in write_behind.redis_client.scan_iter(f"{TEST_ROOM_INDEX}:*"):
+            write_behind.redis_client.delete(key)
+
+    def append(self, content, room_id=None):
+        return async_to_sync(self._append)(content, room_id or self.room.id)
+
+    async def _append(self, content, room_id):
+        # The module's async client belongs to the server's event loop; each
+        # async_to_sync call here runs on a fresh one.
+        client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        try:
+            with mock.patch.object(write_behind, "async_redis_client", client):
+                stream_id, _ = await write_behind.append_message(
+                    self.schema_name, room_id, self.user.id, "Dev", content
+                )
+        finally:
+            await client.aclose()
+        return stream_id
+
+    def pending(self):
+        return write_behind.redis_client.xpending(TEST_STREAM, write_behind.GROUP_NAME)["pending"]
+
+    def test_reclaimed_entry_is_stored_once(self):
+        write_behind._ensure_group()
+        stream_id = self.append("hello")
+        # A previous run read the entry and wrote it, then died before acking.
+        write_behind.redis_client.xreadgroup(write_behind.GROUP_NAME, "crashed", {TEST_STREAM: ">"})
+        write_behind._write([(stream_id, write_behind.redis_client.xrange(TEST_STREAM)[0][1])])
+        self.assertEqual(self.pending(), 1)
+
+        self.assertEqual(write_behind.flush_write_behind(), 1)
+        self.assertEqual(write_behind.flush_write_behind(), 0)
+
+        self.assertEqual(list(Message.objects.values_list('stream_id', flat=True)), [stream_id])
+        self.assertEqual(self.pending(), 0)
+        self.assertEqual(write_behind.redis_client.xlen(TEST_STREAM), 0)
+
+    def test_pending_messages_are_read_per_room(self):
+        first = self.append("first")
+        other_room = ChatRoom.objects.create(room_type='PRIVATE')
+        for i in range(5):
+            self.append(f"elsewhere {i}", room_id=other_room.id)
+        second = self.append("second")
+
+        pending = write_behind.pending_messages(self.schema_name, self.room.id)
+        self.assertEqual([m["id"] for m in pending], [second, first])
+        self.assertEqual([m["content"] for m in pending], ["second", "first"])
+        self.assertEqual(len(write_behind.pending_messages(self.schema_name, self.room.id, limit=1)), 1)
+
+        write_behind.flush_write_behind()
+        self.assertEqual(write_behind.pending_messages(self.schema_name, self.room.id), [])
+        self.assertEqual(list(write_behind.redis_client.scan_iter(f"{TEST_ROOM_INDEX}:*")), [])
+
+    def history(self, **params):
+        request = APIRequestFactory().get(f"/chat-rooms/{self.room.id}/messages/", params)
+        request.tenant = self.tenant
+        force_authenticate(request, user=self.user)
+        response = ChatRoomMessagesView.as_view()(request, room_id=self.room.id)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_pending_messages_count_against_the_page_limit(self):
+        self.room.participants.add(self.user)
+        for i in range(3):
+            Message.objects.create(room=self.room, sender=self.user, content=f"stored {i}")
+        self.append("pending 0")
+        self.append("pending 1")
+
+        page = self.history(limit=3)
+        self.assertEqual([m["content"] for m in page["results"]], ["pending 1", "pending 0", "stored 2"])
+        self.assertTrue(page["has_more"])
+        page = self.history(limit=3, before=page["next_cursor"])
+        self.assertEqual([m["content"] for m in page["results"]], ["stored 1", "stored 0"])
+        self.assertFalse(page["has_more"])
+
+        # Pending messages fill the whole page; the cursor still reaches every stored row.
+        page = self.history(limit=2)
+        self.assertEqual([m["content"] for m in page["results"]], ["pending 1", "pending 0"])
+        self.assertTrue(page["has_more"])
+        page = self.history(limit=3, before=page["next_cursor"])
+        self.assertEqual([m["content"] for m in page["results"]], ["stored 2", "stored 1", "stored 0"])
+
+    def test_bad_row_is_dead_lettered_alone(self):
+        good = [self.append(f"message {i}") for i in range(3)]
+        bad = self.append("to a deleted room", room_id=uuid.uuid4())
+        good.append(self.append("after the bad one"))
+
+        self.assertEqual(write_behind.flush_write_behind(), 4)
+
+        self.assertCountEqual(Message.objects.values_list('stream_id', flat=True), good)
+        dead = write_behind.redis_client.xrange(TEST_DEAD_LETTERS)
+        self.assertEqual([fields["stream_id"] for _, fields in dead], [bad])
+        self.assertEqual(self.pending(), 0)
+        self.assertEqual(write_behind.redis_client.xlen(TEST_STREAM), 0)
+        self.assertEqual(list(write_behind.redis_client.scan_iter(f"{TEST_ROOM_INDEX}:*")), [])
+
+
+class ChatMessageSearchTests(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = "Test"
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="dev@example.com", password="x", role=UserRoles.DEVELOPER, tenant=self.tenant
+        )
+        self.room = ChatRoom.objects.create(room_type='PRIVATE')
+        self.room.participants.add(self.user)
+
+    def search(self, terms):
+        request = APIRequestFactory().get("/chat-rooms/search/", {"q": terms})
+        force_authenticate(request, user=self.user)
+        response = ChatMessageSearchView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_headline_escapes_message_content(self):
+        Message.objects.create(
+            room=self.room, sender=self.user, content='deploy when x<y & "ready" today'
+        )
+
+        [result] = self.search("deploy")
+
+        self.assertEqual(
+            result["headline"], '<mark>deploy</mark> when x&lt;y &amp; &quot;ready&quot; today'
+        )
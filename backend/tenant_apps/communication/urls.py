@@ -1,8 +1,13 @@
 from django.urls import path
-from .views import CreatePrivateChatRoomView, ChatRoomMessagesView, ChatRoomListView
+from .views import (
+    CreatePrivateChatRoomView, ChatRoomMessagesView, ChatRoomListView, ChatRoomPresenceView,
+    ChatMessageSearchView,
+)
 
 urlpatterns = [
     path('private-chat/', CreatePrivateChatRoomView.as_view(), name='create-private-chat'),
+    path('chat-rooms/search/', ChatMessageSearchView.as_view(), name='chat-message-search'),
     path('chat-rooms/', ChatRoomListView.as_view(), name='chatroom-list'),
     path('chat-rooms/<uuid:room_id>/messages/', ChatRoomMessagesView.as_view(), name='chatroom-messages'),
+    path('chat-rooms/<uuid:room_id>/presence/', ChatRoomPresenceView.as_view(), name='chatroom-presence'),
 ]
\ No newline at end of file
@@ -1,11 +1,18 @@
 from rest_framework.views import APIView
+from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.exceptions import PermissionDenied, ValidationError
-from .models import ChatRoom, Message
-from django.db.models import Count
-from .serializers import ChatRoomSerializer, MessageSerializer
+from .models import ChatRoom, Message, RoomReadState
+from django.db.models import F, Q
+from .serializers import (
+    ChatRoomSerializer, MessageSerializer, MessageSearchResultSerializer, HEADLINE_START, HEADLINE_STOP,
+)
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
 from django.contrib.auth import get_user_model
+from core.pagination import encode_keyset_cursor, decode_keyset_cursor
+from . import archive, presence, write_behind
+import uuid
 
 User = get_user_model()
 
@@ -15,7 +22,6 @@ class CreatePrivateChatRoomView(APIView):
 
     def post(self, request):
         participants = request.data.get('participants', [])
-        room_type = 'PRIVATE'
         current_user_id = str(request.user.id)
 
         if current_user_id not in [str(p) for p in participants]:
@@ -23,36 +29,51 @@ class CreatePrivateChatRoomView(APIView):
 
         if len(participants) != 2:
             raise ValidationError("Private chat must have exactly 2 participants.")
-        
-        participant_ids = sorted(participants)
 
-        existing = ChatRoom.objects.annotate(num_participants=Count('participants'))\
-            .filter(room_type='PRIVATE', participants__id__in=participant_ids)\
-            .filter(num_participants=2)
-
-        for room in existing:
-            room_ids = sorted([str(u.id) for u in room.participants.all()])
-            if room_ids == participant_ids:
-                serializer = ChatRoomSerializer(room)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+        other_user_id = next((p for p in participants if str(p) != current_user_id), None)
+        if other_user_id is None:
+            raise ValidationError("Private chat must have exactly 2 participants.")
+        try:
+            other_user_id = int(other_user_id)
+        except (TypeError, ValueError):
+            raise ValidationError("Invalid participant.")
+        if not User.objects.filter(id=other_user_id).exists():
+            raise ValidationError("Invalid participant.")
 
-        room = ChatRoom.objects.create(room_type=room_type)
-        room.participants.set(User.objects.filter(id__in=participants))
+        room, created = ChatRoom.objects.get_or_create_private(request.user.id, other_user_id)
         serializer = ChatRoomSerializer(room)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
 class ChatRoomListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        rooms = ChatRoom.objects.filter(participants=request.user).order_by('-created_at')
+        # Four queries however many rooms: rooms (+ last message, sender, project,
+        # unread count), participants, read states.
+        rooms = (
+            ChatRoom.objects.filter(participants=request.user)
+            .select_related('project', 'last_message__sender')
+            .prefetch_related('participants', 'read_states')
+            .with_unread_count(request.user.id)
+            .order_by(F('last_message_at').desc(nulls_last=True), '-created_at')
+        )
         serializer = ChatRoomSerializer(rooms, many=True)
         return Response(serializer.data)
 
 
 class ChatRoomMessagesView(APIView):
+    """
+    Keyset-paginated history, newest first.
+
+    ?before=<cursor> pages back in time, ?after=<cursor> pages forward. Each page
+    costs one index range scan on (room, timestamp) regardless of room size.
+    Pages past the oldest live message are served from the archive. Unflushed
+    write-behind messages open the first page and count toward its limit.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    default_limit = 50
+    max_limit = 100
 
     def get(self, request, room_id):
         try:
@@ -60,6 +81,149 @@ class ChatRoomMessagesView(APIView):
         except ChatRoom.DoesNotExist:
             return Response({"detail": "Chat room not found."}, status=404)
 
-        messages = Message.objects.filter(room=room).order_by('-timestamp')[:100]
-        serializer = MessageSerializer(messages, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        before = request.query_params.get('before')
+        after = request.query_params.get('after')
+        if before and after:
+            raise ValidationError({"detail": "Use either 'before' or 'after', not both."})
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"detail": "Invalid limit."})
+        limit = max(limit, 1)
+
+        messages = Message.objects.filter(room=room).select_related('sender')
+        if before:
+            timestamp, pk = decode_keyset_cursor(before)
+            messages = messages.filter(
+                Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk)
+            ).order_by('-timestamp', '-id')
+        elif after:
+            timestamp, pk = decode_keyset_cursor(after)
+            messages = messages.filter(
+                Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk)
+            ).order_by('timestamp', 'id')
+        else:
+            messages = messages.order_by('-timestamp', '-id')
+
+        # Unflushed write-behind messages are newer than anything stored. On the
+        # first page they take their share of the limit before any rows are read.
+        pending = []
+        if write_behind.is_enabled() and not before and not after:
+            pending = write_behind.pending_messages(request.tenant.schema_name, room.id, limit)
+        stored_limit = limit - len(pending)
+
+        # Live rows come first; once they run out the page continues from the
+        # archive, which only holds messages older than every live one.
+        if after:
+            archived = archive.messages_after(room.id, (timestamp, pk), limit + 1)
+            live = list(messages[:limit + 1 - len(archived)])
+            keys = [(row['timestamp'], row['id']) for row in archived] + [(m.timestamp, m.id) for m in live]
+        else:
+            live = list(messages[:stored_limit + 1])
+            archived = []
+            if len(live) <= stored_limit:
+                if live:
+                    boundary = (live[-1].timestamp, live[-1].id)
+                else:
+                    boundary = (timestamp, pk) if before else None
+                archived = archive.messages_before(room.id, boundary, stored_limit + 1 - len(live))
+            keys = [(m.timestamp, m.id) for m in live] + [(row['timestamp'], row['id']) for row in archived]
+
+        has_more = len(keys) > stored_limit
+        if not has_more:
+            next_cursor = None
+        elif stored_limit:
+            next_cursor = encode_keyset_cursor(*keys[stored_limit - 1])
+        else:
+            # Pending messages filled the page; the next one starts at the newest stored row.
+            newest_timestamp, newest_pk = keys[0]
+            next_cursor = encode_keyset_cursor(newest_timestamp, newest_pk + 1)
+
+        watermarks = RoomReadState.objects.watermarks(room.id)
+        if after:
+            archived = archived[:limit]
+            live = live[:limit - len(archived)]
+            live_results = MessageSerializer(live, many=True, context={'watermarks': watermarks}).data
+            archived_results = archive.serialize_archived(archived, watermarks)
+            results = list(reversed(archived_results + list(live_results)))
+            # Caught up: pending messages fill what room is left, oldest first so
+            # the page stays contiguous. The rest show up once flushed.
+            room_left = limit - len(results)
+            if write_behind.is_enabled() and not has_more and room_left:
+                pending = write_behind.pending_messages(request.tenant.schema_name, room.id, limit)
+                pending = pending[max(len(pending) - room_left, 0):]
+        else:
+            live = live[:stored_limit]
+            archived = archived[:stored_limit - len(live)]
+            live_results = MessageSerializer(live, many=True, context={'watermarks': watermarks}).data
+            results = list(live_results) + archive.serialize_archived(archived, watermarks)
+
+        results = pending + results
+
+        return Response({
+            "results": results,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        })
+
+
+class ChatRoomPresenceView(APIView):
+    """
+    Presence of every participant of a room, looked up in one Redis pipeline.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, room_id):
+        try:
+            room = ChatRoom.objects.get(id=room_id, participants=request.user)
+        except ChatRoom.DoesNotExist:
+            return Response({"detail": "Chat room not found."}, status=404)
+
+        participant_ids = room.participants.values_list('id', flat=True)
+        connections = presence.bulk_presence(participant_ids)
+        return Response({
+            "results": [
+                {"user_id": user_id, "online": count > 0, "connections": count}
+                for user_id, count in connections.items()
+            ]
+        })
+
+
+class ChatMessageSearchView(ListAPIView):
+    """
+    Full-text search over messages in the caller's rooms, best match first.
+
+    ?q= takes web-search syntax ("quoted phrases", -excluded, or). ?room=<uuid>
+    narrows to one room. Matching uses the GIN index on Message.search_vector;
+    snippets are only built for the returned page.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = MessageSearchResultSerializer
+
+    def get_queryset(self):
+        terms = self.request.query_params.get('q', '').strip()
+        if not terms:
+            raise ValidationError({"detail": "Query parameter 'q' is required."})
+
+        query = SearchQuery(terms, search_type='websearch', config='english')
+        rooms = ChatRoom.objects.filter(participants=self.request.user)
+        room_id = self.request.query_params.get('room')
+        if room_id:
+            try:
+                rooms = rooms.filter(id=uuid.UUID(room_id))
+            except ValueError:
+                raise ValidationError({"detail": "Invalid room."})
+
+        return (
+            Message.objects.filter(room__in=rooms.values('id'), search_vector=query)
+            .select_related('sender')
+            .annotate(
+                rank=SearchRank('search_vector', query),
+                headline=SearchHeadline(
+                    'content', query, config='english',
+                    start_sel=HEADLINE_START, stop_sel=HEADLINE_STOP, max_fragments=2,
+                ),
+            )
+            .order_by('-rank', '-timestamp', '-id')
+        )
@@ -0,0 +1,271 @@
+"""
+Write-behind chat persistence.
+
+With CHAT_WRITE_BEHIND enabled, ChatConsumer appends each message to a Redis
+Stream and broadcasts it straight away, using the stream entry id as the
+server-assigned message id. `flush_write_behind` (run by a Celery beat task)
+reads the stream through a consumer group, bulk-inserts each tenant's messages
+and acks them.
+
+Each entry id is also pushed to a per-room list,
+`chat:write_behind:room:{schema}:{room}`, by the same script that runs the
+XADD. `pending_messages` reads a room's unflushed messages through that list
+instead of scanning the shared stream; ids leave it when their entries are acked.
+
+Entries that fail to insert stay pending and are re-claimed on a later run.
+After CHAT_WRITE_BEHIND_MAX_DELIVERIES attempts they go to a dead-letter stream.
+When a bulk insert is rejected by a bad row (say, a message for a room that was
+deleted), the batch is split in halves until the offending rows are isolated.
+Only those go to the dead-letter stream; the rest are stored. Inserts are
+idempotent on Message.stream_id, so a retry after a partial failure never
+duplicates a message.
+"""
+
+import logging
+import socket
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_tenants.utils import schema_context
+
+from tenant_apps.communication.models import Message
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "chat:write_behind"
+DEAD_LETTER_KEY = "chat:write_behind:dead"
+FLUSH_LOCK_KEY = "chat:write_behind:flush"
+ROOM_INDEX_PREFIX = "chat:write_behind:room"
+GROUP_NAME = "chat-writers"
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+async_redis_client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# Appends the entry and indexes it under its room in one step, so the room
+# list is always in stream order. KEYS: stream, room index. ARGV: field/value pairs.
+_APPEND = async_redis_client.register_script("""
+local stream_id = redis.call('XADD', KEYS[1], '*', unpack(ARGV))
+redis.call('RPUSH', KEYS[2], stream_id)
+return stream_id
+""")
+
+
+def is_enabled():
+    return getattr(settings, "CHAT_WRITE_BEHIND", False)
+
+
+def is_stream_id(message_id):
+    return isinstance(message_id, str) and "-" in message_id
+
+
+def room_index_key(schema_name, room_id):
+    return f"{ROOM_INDEX_PREFIX}:{schema_name}:{room_id}"
+
+
+async def append_message(schema_name, room_id, sender_id, sender_name, content):
+    """
+    Queues a message for persistence. Returns (stream_id, timestamp).
+    """
+    timestamp = timezone.now()
+    fields = {
+        "schema": schema_name,
+        "room": str(room_id),
+        "sender": sender_id,
+        "sender_name": sender_name,
+        "content": content,
+        "timestamp": timestamp.isoformat(),
+    }
+    stream_id = await _APPEND(
+        keys=[STREAM_KEY, room_index_key(schema_name, room_id)],
+        args=[item for pair in fields.items() for item in pair],
+        client=async_redis_client,
+    )
+    return stream_id, timestamp
+
+
+def pending_messages(schema_name, room_id, limit=100):
+    """
+    Messages of a room that are still waiting in the stream, newest first,
+    shaped like MessageSerializer output.
+    """
+    stream_ids = redis_client.lrange(room_index_key(schema_name, room_id), -limit, -1)
+    if not stream_ids:
+        return []
+
+    pipe = redis_client.pipeline(transaction=False)
+    for stream_id in reversed(stream_ids):
+        pipe.xrange(STREAM_KEY, min=stream_id, max=stream_id)
+
+    pending = []
+    for found in pipe.execute():
+        # Acked between LRANGE and XRANGE.
+        if not found:
+            continue
+        stream_id, fields = found[0]
+        pending.append({
+            "id": stream_id,
+            "sender": int(fields["sender"]),
+            "sender_name": fields["sender_name"],
+            "content": fields["content"],
+            "timestamp": fields["timestamp"],
+            "seen_by": [],
+            "pending": True,
+        })
+
+    if pending:
+        # Entries flushed a moment ago but not yet deleted are already in the table.
+        flushed = set(
+            Message.objects.filter(stream_id__in=[m["id"] for m in pending]).values_list("stream_id", flat=True)
+        )
+        pending = [m for m in pending if m["id"] not in flushed]
+
+    return pending
+
+
+def _ensure_group():
+    try:
+        redis_client.xgroup_create(STREAM_KEY, GROUP_NAME, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _claim_stale(consumer, batch_size):
+    """
+    Re-claims entries another run read but never acked, dead-lettering the ones
+    that keep failing.
+    """
+    stale = redis_client.xpending_range(
+        STREAM_KEY, GROUP_NAME, min="-", max="+", count=batch_size,
+        idle=settings.CHAT_WRITE_BEHIND_RETRY_AFTER_MS,
+    )
+    if not stale:
+        return []
+
+    max_deliveries = settings.CHAT_WRITE_BEHIND_MAX_DELIVERIES
+    dead = [p["message_id"] for p in stale if p["times_delivered"] >= max_deliveries]
+    retry = [p["message_id"] for p in stale if p["times_delivered"] < max_deliveries]
+
+    if dead:
+        dead_ids = set(dead)
+        _dead_letter([
+            (stream_id, fields)
+            for stream_id, fields in redis_client.xrange(STREAM_KEY, min=dead[0], max=dead[-1])
+            if stream_id in dead_ids
+        ])
+        logger.error(f"Dead-lettered {len(dead)} chat messages after {max_deliveries} attempts")
+
+    if not retry:
+        return []
+    return redis_client.xclaim(
+        STREAM_KEY, GROUP_NAME, consumer, settings.CHAT_WRITE_BEHIND_RETRY_AFTER_MS, retry
+    )
+
+
+def _dead_letter(entries):
+    pipe = redis_client.pipeline(transaction=False)
+    for stream_id, fields in entries:
+        pipe.xadd(DEAD_LETTER_KEY, {**fields, "stream_id": stream_id})
+    _remove(pipe, entries)
+    pipe.execute()
+
+
+def _remove(pipe, entries):
+    """
+    Queues the ack and delete of entries on pipe, along with their room index ids.
+    """
+    ids = [stream_id for stream_id, _ in entries]
+    pipe.xack(STREAM_KEY, GROUP_NAME, *ids)
+    pipe.xdel(STREAM_KEY, *ids)
+    for stream_id, fields in entries:
+        pipe.lrem(room_index_key(fields["schema"], fields["room"]), 1, stream_id)
+
+
+def _write(entries):
+    """
+    Bulk-inserts entries per tenant schema. Returns (stored, rejected): the
+    stream ids that are safely stored and the entries no retry can store.
+    """
+    by_schema = {}
+    for stream_id, fields in entries:
+        by_schema.setdefault(fields["schema"], []).append((stream_id, fields))
+
+    stored, rejected = [], []
+    for schema_name, items in by_schema.items():
+        try:
+            with schema_context(schema_name):
+                ok, bad = _insert(items)
+        except Exception:
+            logger.exception(f"Write-behind flush failed for schema {schema_name}; will retry")
+            continue
+        stored.extend(ok)
+        rejected.extend(bad)
+
+    return stored, rejected
+
+
+def _insert(items):
+    """
+    Inserts items with one bulk_create. If a row violates a constraint, splits
+    the batch in halves to isolate it. Returns (stored ids, rejected entries).
+    Other errors (connection loss, timeouts) propagate so the batch is retried.
+    """
+    try:
+        # Foreign keys are checked at commit, so each attempt is its own transaction.
+        with transaction.atomic():
+            Message.objects.bulk_create(
+                [
+                    Message(
+                        room_id=fields["room"],
+                        sender_id=int(fields["sender"]),
+                        content=fields["content"],
+                        timestamp=parse_datetime(fields["timestamp"]),
+                        stream_id=stream_id,
+                    )
+                    for stream_id, fields in items
+                ],
+                ignore_conflicts=True,
+            )
+    except (IntegrityError, DataError, ValueError) as e:
+        if len(items) == 1:
+            logger.error(f"Chat message {items[0][0]} rejected: {e}")
+            return [], items
+        middle = len(items) // 2
+        left_ok, left_bad = _insert(items[:middle])
+        right_ok, right_bad = _insert(items[middle:])
+        return left_ok + right_ok, left_bad + right_bad
+
+    return [stream_id for stream_id, _ in items], []
+
+
+def flush_write_behind(batch_size=None):
+    """
+    Persists one batch of queued messages. Returns the number of messages stored.
+    """
+    batch_size = batch_size or settings.CHAT_WRITE_BEHIND_BATCH_SIZE
+    consumer = socket.gethostname()
+    _ensure_group()
+
+    entries = list(_claim_stale(consumer, batch_size))
+    response = redis_client.xreadgroup(GROUP_NAME, consumer, {STREAM_KEY: ">"}, count=batch_size)
+    for _, new_entries in response:
+        entries.extend(new_entries)
+
+    # Entries deleted between XPENDING and XCLAIM come back with no fields.
+    entries = [(stream_id, fields) for stream_id, fields in entries if fields]
+    if not entries:
+        return 0
+
+    stored, rejected = _write(entries)
+    if stored:
+        stored_ids = set(stored)
+        pipe = redis_client.pipeline(transaction=False)
+        _remove(pipe, [(stream_id, fields) for stream_id, fields in entries if stream_id in stored_ids])
+        pipe.execute()
+    if rejected:
+        _dead_letter(rejected)
+    return len(stored)
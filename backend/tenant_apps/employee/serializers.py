@@ -6,6 +6,7 @@ from django.utils import timezone
 from django_tenants.utils import schema_context
 from django.db import transaction
 from tenant_apps.employee.tasks.email_tasks import send_set_password_email_task, send_role_change_email
+from shared_apps.mailer.outbox import enqueue
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_str
@@ -126,7 +127,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
                     )
 
             token = default_token_generator.make_token(user)
-            send_set_password_email_task.delay(user.id, token)
+            enqueue(send_set_password_email_task, user.id, token)
 
         return employee
 
@@ -142,7 +143,8 @@ class EmployeeSerializer(serializers.ModelSerializer):
             instance.user.role = role
             instance.user.save()
 
-            send_role_change_email.delay(
+            enqueue(
+                send_role_change_email,
                 full_name=instance.full_name,
                 email=instance.user.email,
                 old_role=old_role,
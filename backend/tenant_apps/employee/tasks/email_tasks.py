@@ -1,14 +1,13 @@
 from celery import shared_task
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django_tenants.utils import schema_context
 from django.conf import settings
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from shared_apps.tenants.models import Domain
 from tenant_apps.employee.models import Employee
-from django.template.loader import render_to_string
-from premailer import transform
+from shared_apps.mailer.dispatch import send_email
+from shared_apps.mailer.rendering import render_email
 from django.contrib.auth import get_user_model
 from core.constants import UserRoles
 
@@ -39,13 +38,12 @@ def send_set_password_email_task(user_id, token):
 
     subject = "Set your password for Teamora"
  
-    html_message = render_to_string("emails/set_password_email.html", {
+    html_message = render_email("emails/set_password_email.html", {
         'full_name': full_name,
         'email': user.email,
         'reset_url': reset_url,
         'tenant_name': tenant_name,
     })
-    html_message = transform(html_message)
 
     plain_message = (
         f"Hello {full_name},\n\n"
@@ -57,13 +55,11 @@ def send_set_password_email_task(user_id, token):
         f"Thanks,\nThe Teamora Team"
     )
 
-    send_mail(
+    send_email(
         subject=subject,
         message=plain_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[user.email],
         html_message=html_message,
-        fail_silently=False,
     )
 
 @shared_task
@@ -73,7 +69,7 @@ def send_role_change_email(full_name, email, old_role, new_role, tenant_name):
     old_label = UserRoles(old_role).label
     new_label = UserRoles(new_role).label
 
-    html_message = render_to_string("emails/project_management/role_changed_email.html", {
+    html_message = render_email("emails/project_management/role_changed_email.html", {
         'full_name': full_name,
         'email': email,
         'old_role': old_label,
@@ -90,11 +86,9 @@ def send_role_change_email(full_name, email, old_role, new_role, tenant_name):
         f"— Teamora Team"
     )
 
-    send_mail(
+    send_email(
         subject=subject,
         message=plain_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[email],
         html_message=html_message,
-        fail_silently=False,
     )
\ No newline at end of file
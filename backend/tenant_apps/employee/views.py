@@ -9,6 +9,7 @@ from shared_apps.custom_auth.models import User
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_decode
 from tenant_apps.employee.tasks.email_tasks import send_set_password_email_task
+from shared_apps.mailer.outbox import enqueue
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
@@ -62,7 +63,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         user.save()
 
         token = default_token_generator.make_token(user)
-        send_set_password_email_task.delay(user.pk, token)
+        enqueue(send_set_password_email_task, user.pk, token)
 
         return Response({"detail": "Invitation resent."}, status=status.HTTP_200_OK)
 
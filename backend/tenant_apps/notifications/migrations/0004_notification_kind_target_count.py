@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_unread_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('general', 'General'), ('subtask_assigned', 'Subtask Assigned'), ('subtask_unassigned', 'Subtask Unassigned'), ('blocking_subtasks', 'Blocking Subtasks'), ('digest', 'Digest')], default='general', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='target',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
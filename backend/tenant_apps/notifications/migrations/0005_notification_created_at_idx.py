@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built concurrently so existing tables stay writable while the index builds.
+    atomic = False
+
+    dependencies = [
+        ('notifications', '0004_notification_kind_target_count'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(fields=['created_at'], name='notification_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import transaction
+from rest_framework.permissions import SAFE_METHODS
+
+from tenant_apps.notifications.utils.side_effects import SideEffectCollector
+
+
+class SideEffectsMixin:
+    """
+    Gives a view a per-request `self.side_effects` collector.
+
+    Unsafe methods run inside a single transaction, so collected notifications
+    and emails go out together after the write commits, or not at all.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+
+        with transaction.atomic():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.side_effects = SideEffectCollector(request.tenant.schema_name)
+
+    def handle_exception(self, exc):
+        # DRF turns exceptions into responses, so roll back explicitly.
+        if transaction.get_connection().in_atomic_block:
+            transaction.set_rollback(True)
+        return super().handle_exception(exc)
@@ -1,13 +1,47 @@
 from django.db import models
+from core.constants import NotificationKind
 from tenant_apps.employee.models import Employee
 
 # Create your models here.
+class NotificationQuerySet(models.QuerySet):
+    def mark_read(self, ids=None):
+        """
+        Marks unread rows (optionally only `ids`) read with one UPDATE and
+        returns how many changed, which is what the unread counter moves by.
+        """
+        unread = self.filter(is_read=False)
+        if ids is not None:
+            unread = unread.filter(id__in=ids)
+        return unread.update(is_read=True)
+
+
 class Notification(models.Model):
     recipient = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='notifications')
     message = models.TextField()
     url = models.URLField(blank=True, null=True)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    kind = models.CharField(max_length=30, choices=NotificationKind.choices, default=NotificationKind.GENERAL)
+    # What the notification is about, e.g. "project:12"; coalescing groups by (recipient, kind, target).
+    target = models.CharField(max_length=100, blank=True, default='')
+    # How many events were merged into this row.
+    count = models.PositiveIntegerField(default=1)
+
+    objects = NotificationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['recipient', 'created_at'], name='notification_recipient_ts_idx'),
+            # Retention scans expired rows oldest first across all recipients.
+            models.Index(fields=['created_at'], name='notification_created_at_idx'),
+            # Unread rows are a small slice of the table; the badge recount and
+            # ?is_read=false inbox pages only ever scan this.
+            models.Index(
+                fields=['recipient', 'created_at'],
+                condition=models.Q(is_read=False),
+                name='notification_unread_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"To {self.recipient.full_name}: {self.message[:30]}"
\ No newline at end of file
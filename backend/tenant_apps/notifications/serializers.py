@@ -4,4 +4,4 @@ from tenant_apps.notifications.models import Notification
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = ['id', 'message', 'url', 'is_read', 'created_at']
\ No newline at end of file
+        fields = ['id', 'message', 'url', 'is_read', 'created_at', 'kind', 'target', 'count']
\ No newline at end of file
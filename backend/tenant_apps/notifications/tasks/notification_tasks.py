@@ -1,34 +1,113 @@
 # tenant_apps/notifications/tasks/notification_tasks.py
 
-from celery import shared_task
-from django.utils.timezone import now
+import logging
+from collections import Counter, defaultdict
+
+from celery import shared_task, current_app
+from django.conf import settings
 from django_tenants.utils import schema_context
-from django.db import transaction
 
+from core.constants import NotificationKind
 from tenant_apps.notifications.models import Notification
 from tenant_apps.employee.models import Employee
-from tenant_apps.notifications.utils.notification_utils import send_realtime_notification
+from tenant_apps.notifications.utils import coalescing, unread_counter
+from tenant_apps.notifications.utils.notification_utils import send_realtime_notifications
+
+logger = logging.getLogger(__name__)
+
 
 @shared_task
 def send_notification_task(schema_name, recipient_id, message, url=None):
     """
     Creates a notification and broadcasts it via WebSocket.
     """
+    send_notifications_task(schema_name, [{"recipient_id": recipient_id, "message": message, "url": url}])
+
+
+@shared_task
+def send_notifications_task(schema_name, items):
+    """
+    Fan-out: creates notifications for many recipients with one bulk_create and
+    pushes every WebSocket frame over a single event loop. Each item is
+    {"recipient_id", "message", "url"} plus optional "kind" and "target";
+    unknown recipients are skipped. Coalesced and digest kinds are parked
+    first (see utils/coalescing.py) and delivered later as one notification.
+    """
+    if not items:
+        return
+
+    immediate, opened = coalescing.route(schema_name, items)
+    for key in opened:
+        flush_coalesced_notifications_task.apply_async(
+            (schema_name, key), countdown=settings.NOTIFICATION_COALESCE_WINDOW
+        )
+    deliver_notifications(schema_name, immediate)
+
+
+def deliver_notifications(schema_name, items):
+    if not items:
+        return
+
     with schema_context(schema_name):
+        user_ids = dict(
+            Employee.objects.filter(id__in={item["recipient_id"] for item in items})
+            .values_list("id", "user_id")
+        )
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient_id=item["recipient_id"],
+                message=item["message"],
+                url=item.get("url"),
+                kind=item.get("kind") or NotificationKind.GENERAL,
+                target=item.get("target", ""),
+                count=item.get("count", 1),
+            )
+            for item in items
+            if item["recipient_id"] in user_ids
+        ])
+        unread_counter.increment(schema_name, Counter(n.recipient_id for n in notifications))
+
+        send_realtime_notifications([
+            (user_ids[notification.recipient_id], notification) for notification in notifications
+        ])
+
+
+@shared_task(ignore_result=True)
+def flush_coalesced_notifications_task(schema_name, key):
+    """
+    Closes one coalescing window and delivers what gathered as a single notification.
+    """
+    items = coalescing.take_window(key)
+    if items:
+        deliver_notifications(schema_name, [coalescing.merge(items)])
+
+
+@shared_task(ignore_result=True)
+def send_notification_digests_task():
+    """
+    Sends every recipient one summary of their pending digest-kind notifications.
+    """
+    digests = defaultdict(list)
+    for schema_name, recipient_id, items in coalescing.take_digests():
+        digests[schema_name].append(coalescing.digest(recipient_id, items))
+
+    for schema_name, items in digests.items():
+        deliver_notifications(schema_name, items)
+    return sum(len(items) for items in digests.values())
+
+
+@shared_task
+def dispatch_side_effects_task(schema_name, notifications=None, emails=None):
+    """
+    Delivers everything a single request collected: its notifications, then its
+    emails. Emails now go through the email outbox; `emails` is only set by
+    messages queued before that change.
+    """
+    if notifications:
+        send_notifications_task(schema_name, notifications)
+
+    for item in emails or []:
         try:
-            recipient = Employee.objects.select_related('user').get(id=recipient_id)
-
-            with transaction.atomic():
-                notification = Notification.objects.create(
-                    recipient=recipient,
-                    message=message,
-                    url=url,
-                    created_at=now()
-                )
-
-                # WebSocket push
-                send_realtime_notification(notification)
-
-        except Employee.DoesNotExist:
-            # Optionally log or handle failure
-            pass
\ No newline at end of file
+            current_app.tasks[item["task"]](*item["args"], **item["kwargs"])
+        except Exception:
+            logger.exception(f"Side-effect email task {item['task']} failed")
@@ -1,3 +1,105 @@
-from django.test import TestCase
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django_tenants.test.cases import TenantTestCase
+
+from core.constants import UserRoles
+from shared_apps.custom_auth.models import User
+from shared_apps.tenants.retention import apply_policy
+from tenant_apps.employee.models import Employee
+from tenant_apps.notifications.models import Notification
+from tenant_apps.notifications.tasks.notification_tasks import deliver_notifications
+from tenant_apps.notifications.utils import unread_counter
+from tenant_apps.notifications.utils.notification_stream import mark_read
+
+
+class UnreadCounterTests(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = "Test"
+
+    def setUp(self):
+        self.schema_name = self.tenant.schema_name
+        user = User.objects.create_user(
+            email="dev@example.com", password="x", role=UserRoles.DEVELOPER, tenant=self.tenant
+        )
+        self.employee = Employee.objects.create(
+            user=user, full_name="Dev", job_title="Developer", department="Engineering", date_joined=date.today()
+        )
+        self.clear_counter()
+
+    def tearDown(self):
+        self.clear_counter()
+
+    def clear_counter(self):
+        unread_counter.redis_client.delete(
+            unread_counter.counter_key(self.schema_name, self.employee.id),
+            unread_counter.version_key(self.schema_name, self.employee.id),
+        )
+
+    def notify(self, n):
+        deliver_notifications(self.schema_name, [
+            {"recipient_id": self.employee.id, "message": f"Update {i}"} for i in range(n)
+        ])
+        return list(Notification.objects.filter(recipient=self.employee).order_by('id'))
+
+    def unread_in_db(self):
+        return Notification.objects.filter(recipient=self.employee, is_read=False).count()
+
+    def cached_count(self):
+        cached = unread_counter.redis_client.get(unread_counter.counter_key(self.schema_name, self.employee.id))
+        return None if cached is None else int(cached)
+
+    def test_delivery_increments_a_warm_counter(self):
+        self.assertEqual(unread_counter.get_unread_count(self.schema_name, self.employee.id), 0)
+        self.notify(3)
+        self.assertEqual(self.cached_count(), 3)
+
+    def test_mark_read_moves_counter_by_rows_changed(self):
+        self.assertEqual(unread_counter.get_unread_count(self.schema_name, self.employee.id), 0)
+        notifications = self.notify(4)
+
+        self.assertEqual(mark_read(self.schema_name, self.employee.id, [notifications[0].id]), (1, 3))
+        # Already read: nothing changes, so the counter must not move again.
+        self.assertEqual(mark_read(self.schema_name, self.employee.id, [notifications[0].id]), (0, 3))
+        self.assertEqual(mark_read(self.schema_name, self.employee.id, None), (3, 0))
+
+        self.assertEqual(self.cached_count(), 0)
+        self.assertEqual(self.unread_in_db(), 0)
+
+    def test_counter_matches_database_after_purge(self):
+        self.assertEqual(unread_counter.get_unread_count(self.schema_name, self.employee.id), 0)
+        notifications = self.notify(5)
+        mark_read(self.schema_name, self.employee.id, [notifications[0].id])
+        self.assertEqual(self.cached_count(), 4)
+
+        policy = {
+            "model": "notifications.Notification",
+            "field": "created_at",
+            "days": 0,
+            "filter": {"id__in": [n.id for n in notifications[:3]]},
+            "hook": "tenant_apps.notifications.utils.unread_counter.forget_purged",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(apply_policy(self.schema_name, policy, deadline=float("inf")), 3)
+
+        # One read and two unread rows went; only the unread ones leave the badge.
+        self.assertEqual(self.cached_count(), 2)
+        self.assertEqual(self.unread_in_db(), 2)
+
+    def test_cold_fill_does_not_store_a_count_overtaken_by_a_delivery(self):
+        self.notify(2)
+        real_filter = Notification.objects.filter
+
+        def count_then_deliver(*args, **kwargs):
+            # The COUNT finishes, then a delivery lands before the fill is stored.
+            counted = real_filter(*args, **kwargs).count()
+            deliver_notifications(self.schema_name, [{"recipient_id": self.employee.id, "message": "Late"}])
+            return mock.Mock(count=mock.Mock(return_value=counted))
+
+        with mock.patch.object(Notification.objects, "filter", side_effect=count_then_deliver):
+            self.assertEqual(unread_counter.get_unread_count(self.schema_name, self.employee.id), 2)
+
+        self.assertIsNone(self.cached_count())
+        self.assertEqual(unread_counter.get_unread_count(self.schema_name, self.employee.id), 3)
+        self.assertEqual(self.cached_count(), 3)
@@ -1,7 +1,14 @@
 from django.urls import path, include
-from tenant_apps.notifications.views import NotificationListView, MarkNotificationReadView
+from tenant_apps.notifications.views import (
+    NotificationListView,
+    UnreadNotificationCountView,
+    MarkNotificationReadView,
+    MarkNotificationsReadView,
+)
 
 urlpatterns = [
-#     path('notifications/', NotificationListView.as_view(), name='notification-list'),
-#     path('notifications/<int:pk>/read/', MarkNotificationReadView.as_view(), name='notification-read'),
-]
\ No newline at end of file
+    path('notifications/', NotificationListView.as_view(), name='notification-list'),
+    path('notifications/unread-count/', UnreadNotificationCountView.as_view(), name='notification-unread-count'),
+    path('notifications/read/', MarkNotificationsReadView.as_view(), name='notification-read-bulk'),
+    path('notifications/<int:pk>/read/', MarkNotificationReadView.as_view(), name='notification-read'),
+]
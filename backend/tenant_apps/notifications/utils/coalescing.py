@@ -0,0 +1,142 @@
+"""
+Notification coalescing and digests.
+
+Bulk edits can raise dozens of near-identical notifications for one person
+within seconds. Items whose kind is in COALESCED_KINDS are parked in a Redis
+list keyed by (schema, recipient, kind, target) instead of being stored right
+away. The first item of a window schedules flush_coalesced_notifications_task
+NOTIFICATION_COALESCE_WINDOW seconds later. That task turns whatever gathered
+into one notification carrying a count, so it costs one row and one frame.
+Coalescing is opt-in: with the default window of 0 every item goes out at once.
+Parked lists expire shortly after their window, so a lost flush task cannot
+leave items behind forever.
+
+Kinds listed in NOTIFICATION_DIGEST_KINDS are not pushed when they happen.
+They wait for send_notification_digests_task, which gives each recipient a
+single summary.
+"""
+
+import json
+
+import redis
+from django.conf import settings
+
+from core.constants import NotificationKind
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# Message used when a window merged more than one item; None keeps the newest message.
+COALESCED_KINDS = {
+    NotificationKind.SUBTASK_ASSIGNED: "{count} subtasks were assigned to you.",
+    NotificationKind.SUBTASK_UNASSIGNED: "You were unassigned from {count} subtasks.",
+    NotificationKind.BLOCKING_SUBTASKS: None,
+}
+
+DIGEST_PENDING_KEY = "notifications:digest:pending"
+
+
+def window_key(schema_name, recipient_id, kind, target):
+    return f"notifications:coalesce:{schema_name}:{recipient_id}:{kind}:{target}"
+
+
+def digest_key(schema_name, recipient_id):
+    return f"notifications:digest:{schema_name}:{recipient_id}"
+
+
+def route(schema_name, items):
+    """
+    Parks coalesced and digest items in Redis. Returns (immediate, opened):
+    the items to deliver now and the window keys this call opened, each of
+    which needs exactly one flush scheduled. If Redis is unavailable,
+    everything is delivered now.
+    """
+    window = settings.NOTIFICATION_COALESCE_WINDOW
+    digest_kinds = set(settings.NOTIFICATION_DIGEST_KINDS)
+
+    immediate = []
+    pipe = redis_client.pipeline(transaction=True)
+    # (position of the SET NX reply, window key) for every parked coalesced item.
+    markers = []
+    for item in items:
+        kind = item.get("kind") or NotificationKind.GENERAL
+        if kind in digest_kinds:
+            key = digest_key(schema_name, item["recipient_id"])
+            pipe.rpush(key, json.dumps(item))
+            pipe.sadd(DIGEST_PENDING_KEY, key)
+        elif window and kind in COALESCED_KINDS:
+            key = window_key(schema_name, item["recipient_id"], kind, item.get("target", ""))
+            # Both outlive the window so a slow flush still finds its items, but
+            # a lost flush task cannot wedge the key or park items for long.
+            expiry = max(window * 6, 60)
+            pipe.rpush(key, json.dumps(item))
+            pipe.expire(key, expiry)
+            pipe.set(f"{key}:open", 1, nx=True, ex=expiry)
+            markers.append((len(pipe) - 1, key))
+        else:
+            immediate.append(item)
+
+    if not len(pipe):
+        return immediate, []
+    try:
+        replies = pipe.execute()
+    except redis.RedisError:
+        return list(items), []
+    return immediate, [key for position, key in markers if replies[position]]
+
+
+def take_window(key):
+    """
+    Removes and returns everything parked under a window key. Closing the
+    window in the same transaction means the next item opens a new one.
+    """
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.lrange(key, 0, -1)
+    pipe.delete(key, f"{key}:open")
+    raw, _ = pipe.execute()
+    return [json.loads(item) for item in raw]
+
+
+def merge(items):
+    """
+    One notification standing for every item of a window.
+    """
+    newest = items[-1]
+    count = sum(item.get("count", 1) for item in items)
+    summary = COALESCED_KINDS.get(newest.get("kind"))
+    urls = {item.get("url") for item in items}
+    return {
+        **newest,
+        "message": summary.format(count=count) if summary and count > 1 else newest["message"],
+        "url": urls.pop() if len(urls) == 1 else None,
+        "count": count,
+    }
+
+
+def take_digests():
+    """
+    Yields (schema_name, recipient_id, items) for every recipient with pending
+    digest items, removing them from Redis as it goes.
+    """
+    for key in redis_client.smembers(DIGEST_PENDING_KEY):
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.lrange(key, 0, -1)
+        pipe.delete(key)
+        pipe.srem(DIGEST_PENDING_KEY, key)
+        raw, _, _ = pipe.execute()
+        if raw:
+            _, _, schema_name, recipient_id = key.split(":")
+            yield schema_name, int(recipient_id), [json.loads(item) for item in raw]
+
+
+def digest(recipient_id, items):
+    if len(items) == 1:
+        return items[0]
+    count = sum(item.get("count", 1) for item in items)
+    return {
+        "recipient_id": recipient_id,
+        "message": f"You have {count} updates since your last digest.",
+        "url": None,
+        "kind": NotificationKind.DIGEST,
+        "target": "",
+        "count": count,
+    }
@@ -0,0 +1,133 @@
+# tenant_apps/notifications/utils/notification_stream.py
+"""
+Notification socket operations shared by NotificationConsumer and the
+multiplexed socket.
+"""
+
+from channels.db import database_sync_to_async
+from django_tenants.utils import schema_context
+
+from tenant_apps.notifications.models import Notification
+from tenant_apps.notifications.utils import unread_counter
+
+REPLAY_LIMIT = 50
+# Most ids one mark-read call may name; "mark all" has no limit.
+MARK_READ_LIMIT = 500
+
+
+def notification_group_name(user_id):
+    return f"user_notifications_{user_id}"
+
+
+def serialize_notification(notification):
+    return {
+        "id": notification.id,
+        "message": notification.message,
+        "url": notification.url,
+        "created_at": notification.created_at.isoformat(),
+        "is_read": notification.is_read,
+        "kind": notification.kind,
+        "count": notification.count,
+    }
+
+
+def event_to_frame(event):
+    return {
+        "id": event.get("id"),
+        "message": event["message"],
+        "url": event.get("url"),
+        "created_at": event.get("created_at"),
+        "is_read": event.get("is_read", False),
+        "kind": event.get("kind", "general"),
+        "count": event.get("count", 1),
+    }
+
+
+def parse_notification_ids(value):
+    """
+    A list of notification ids from client input, or None if it is not one.
+    """
+    if not isinstance(value, list) or not value or len(value) > MARK_READ_LIMIT:
+        return None
+    try:
+        return [int(pk) for pk in value]
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_since(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+@database_sync_to_async
+def replay(schema_name, user, since=None, limit=REPLAY_LIMIT):
+    """
+    One frame with the notifications a (re)connecting client is missing, newest
+    first, plus the unread count. With `since` (the newest id the client holds)
+    only newer rows are sent, so a reconnect with nothing new sends an empty
+    list. `truncated` tells the client there were more than `limit`.
+    """
+    with schema_context(schema_name):
+        notifications = Notification.objects.filter(recipient=user.employee)
+        missing = notifications.filter(id__gt=since) if since else notifications
+        rows = list(missing.order_by("-created_at", "-id")[:limit + 1])
+        unread_count = unread_counter.get_unread_count(schema_name, user.employee.id)
+
+    return {
+        "type": "replay",
+        "notifications": [serialize_notification(n) for n in rows[:limit]],
+        "unread_count": unread_count,
+        "truncated": len(rows) > limit,
+    }
+
+
+def mark_read(schema_name, employee_id, notification_ids=None):
+    """
+    Marks `notification_ids`, or every unread notification when None, read with
+    a single UPDATE and moves the unread counter by the rows that changed.
+    Returns (updated, unread_count).
+    """
+    with schema_context(schema_name):
+        updated = Notification.objects.filter(recipient_id=employee_id).mark_read(notification_ids)
+        unread_counter.decrement(schema_name, employee_id, updated)
+        return updated, unread_counter.get_unread_count(schema_name, employee_id)
+
+
+@database_sync_to_async
+def mark_notifications_read(schema_name, user, notification_ids=None):
+    """
+    Socket counterpart of mark_read; returns the frame sent back to the client.
+    """
+    with schema_context(schema_name):
+        employee_id = user.employee.id
+    updated, unread_count = mark_read(schema_name, employee_id, notification_ids)
+    return {
+        "type": "marked_read",
+        "notification_ids": notification_ids,
+        "updated": updated,
+        "unread_count": unread_count,
+    }
+
+
+def read_request_ids(payload):
+    """
+    Ids named by a socket mark-read payload: [id] for "mark_read" with
+    notification_id, the list for "mark_read" with notification_ids, None for
+    "mark_all_read". Raises ValueError for anything else.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid mark-read request")
+    action = payload.get("action")
+    if action == "mark_all_read":
+        return None
+    if action == "mark_read":
+        if "notification_ids" in payload:
+            ids = parse_notification_ids(payload["notification_ids"])
+        else:
+            ids = parse_notification_ids([payload.get("notification_id")])
+        if ids is not None:
+            return ids
+    raise ValueError("Invalid mark-read request")
@@ -1,31 +1,55 @@
 # tenant_apps/notifications/utils/notification_utils.py
 
+import asyncio
+
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import logging
 
+from tenant_apps.notifications.utils.notification_stream import notification_group_name
+
 logger = logging.getLogger(__name__)
 
-def send_realtime_notification(notification):
-    """
-    Sends a WebSocket notification to the user's group.
-    """
-    channel_layer = get_channel_layer()
-    user_id = notification.recipient.user.id
-    group_name = f"user_notifications_{user_id}"
 
-    payload = {
+def notification_event(notification):
+    return {
         "type": "send.notification",
         "id": notification.id,
         "message": notification.message,
         "url": notification.url,
         "created_at": notification.created_at.isoformat(),
         "is_read": notification.is_read,
+        "kind": notification.kind,
+        "count": notification.count,
     }
 
-    logger.info(f"🔄 Sending WebSocket notification to group {group_name}: {payload}")
 
-    async_to_sync(channel_layer.group_send)(
-        group_name,
-        payload
-    )
\ No newline at end of file
+def send_realtime_notification(notification):
+    """
+    Sends a WebSocket notification to the user's group.
+    """
+    send_realtime_notifications([(notification.recipient.user.id, notification)])
+
+
+def send_realtime_notifications(deliveries):
+    """
+    Sends many (user_id, notification) frames over a single event loop, with
+    the group sends running concurrently instead of one loop hop each.
+    """
+    if not deliveries:
+        return
+
+    channel_layer = get_channel_layer()
+    events = [(notification_group_name(user_id), notification_event(n)) for user_id, n in deliveries]
+    logger.info(f"🔄 Sending {len(events)} WebSocket notifications")
+    async_to_sync(_group_send_all)(channel_layer, events)
+
+
+async def _group_send_all(channel_layer, events):
+    results = await asyncio.gather(
+        *(channel_layer.group_send(group, payload) for group, payload in events),
+        return_exceptions=True,
+    )
+    for (group, _), result in zip(events, results):
+        if isinstance(result, Exception):
+            logger.error(f"WebSocket notification to {group} failed: {result}")
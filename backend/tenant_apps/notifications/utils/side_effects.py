@@ -0,0 +1,48 @@
+# tenant_apps/notifications/utils/side_effects.py
+
+from django.db import transaction
+
+from core.constants import NotificationKind
+from shared_apps.mailer.outbox import enqueue
+
+
+class SideEffectCollector:
+    """
+    Collects the notifications and emails raised while handling one request.
+
+    Notifications are published as a single Celery message once the
+    surrounding transaction commits, and dropped if it rolls back. Emails are
+    written to the email outbox in the same transaction.
+    """
+
+    def __init__(self, schema_name):
+        self.schema_name = schema_name
+        self.notifications = []
+        self._scheduled = False
+
+    def notify(self, recipient_id, message, url=None, kind=NotificationKind.GENERAL, target=""):
+        self.notifications.append({
+            "recipient_id": recipient_id,
+            "message": message,
+            "url": url,
+            "kind": kind,
+            "target": target,
+        })
+        self._schedule()
+
+    def email(self, task, *args, **kwargs):
+        enqueue(task, *args, **kwargs)
+
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            transaction.on_commit(self.publish)
+
+    def publish(self):
+        from tenant_apps.notifications.tasks.notification_tasks import dispatch_side_effects_task
+
+        self._scheduled = False
+        notifications, self.notifications = self.notifications, []
+
+        if notifications:
+            dispatch_side_effects_task.delay(self.schema_name, notifications)
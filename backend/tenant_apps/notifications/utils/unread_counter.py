@@ -0,0 +1,108 @@
+"""
+Per-employee unread notification counter.
+
+The count lives in Redis at `notifications:unread:{schema}:{employee}` so the
+header badge never touches Postgres. It is filled from the database on first
+read and then only moved by INCRBY/DECRBY: creates add, mark-read subtracts.
+
+An adjustment that finds no counter bumps `...:version` instead. A recount
+only stores its result if the version is unchanged since before the COUNT, so
+a create or mark-read that lands while the count is running is never lost in
+a stale fill; the next read simply counts again. The TTL bounds how long any
+remaining drift can survive.
+"""
+
+from collections import Counter
+
+import redis
+from django.conf import settings
+
+from tenant_apps.notifications.models import Notification
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL)
+
+# Adjusts an existing counter by ARGV[1]. With no counter it bumps the version
+# (kept for ARGV[2] seconds) so a recount in flight is not stored. A counter
+# that would go negative is dropped so the next read recounts.
+_ADJUST = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('INCR', KEYS[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('DEL', KEYS[1])
+    return nil
+end
+return value
+""")
+
+# Stores a recount (ARGV[1]) for ARGV[2] seconds unless the version moved
+# away from ARGV[3] ("" for none) or another read filled the counter first.
+_FILL = redis_client.register_script("""
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[3] then
+    return 0
+end
+return redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2], 'NX') and 1 or 0
+""")
+
+
+def counter_key(schema_name, employee_id):
+    return f"notifications:unread:{schema_name}:{employee_id}"
+
+
+def version_key(schema_name, employee_id):
+    return f"{counter_key(schema_name, employee_id)}:version"
+
+
+def get_unread_count(schema_name, employee_id):
+    """
+    Cached count; falls back to one COUNT on the partial unread index when cold.
+    Must run inside the tenant's schema context.
+    """
+    key = counter_key(schema_name, employee_id)
+    cached, version = redis_client.mget(key, version_key(schema_name, employee_id))
+    if cached is not None:
+        return int(cached)
+
+    count = Notification.objects.filter(recipient_id=employee_id, is_read=False).count()
+    _FILL(
+        keys=[key, version_key(schema_name, employee_id)],
+        args=[count, settings.NOTIFICATION_UNREAD_CACHE_TTL, (version or b"").decode()],
+    )
+    return count
+
+
+def _adjust(schema_name, employee_id, n, client=None):
+    _ADJUST(
+        keys=[counter_key(schema_name, employee_id), version_key(schema_name, employee_id)],
+        args=[n, settings.NOTIFICATION_UNREAD_CACHE_TTL],
+        client=client,
+    )
+
+
+def increment(schema_name, counts):
+    """
+    Adds {employee_id: n} to the counters in one pipeline.
+    """
+    if not counts:
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    for employee_id, n in counts.items():
+        _adjust(schema_name, employee_id, n, client=pipe)
+    pipe.execute()
+
+
+def decrement(schema_name, employee_id, n=1):
+    if n:
+        _adjust(schema_name, employee_id, -n)
+
+
+def forget_purged(schema_name, rows):
+    """
+    Retention hook: takes deleted unread notifications off their recipients' counters.
+    """
+    unread = Counter(row["recipient_id"] for row in rows if not row["is_read"])
+    for employee_id, n in unread.items():
+        decrement(schema_name, employee_id, n)
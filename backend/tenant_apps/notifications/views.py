@@ -1,30 +1,99 @@
-from django.shortcuts import render
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from core.pagination import encode_keyset_cursor, decode_keyset_cursor
 from tenant_apps.notifications.models import Notification
 from tenant_apps.notifications.serializers import NotificationSerializer
+from tenant_apps.notifications.utils import unread_counter
+from tenant_apps.notifications.utils.notification_stream import mark_read, parse_notification_ids
 
 # Create your views here.
 class NotificationListView(APIView):
+    """
+    Keyset-paginated inbox, newest first.
+
+    ?cursor=<next_cursor> continues from the previous page and ?is_read=true|false
+    filters. Unread pages are served from the partial unread index.
+    """
     permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
 
     def get(self, request):
-        notifications = Notification.objects.filter(recipient=request.user.employee).order_by('-created_at')
-        serializer = NotificationSerializer(notifications, many=True)
-        return Response(serializer.data)
+        employee = request.user.employee
+        notifications = Notification.objects.filter(recipient=employee)
+
+        is_read = request.query_params.get('is_read')
+        if is_read is not None:
+            if is_read.lower() not in ('true', 'false'):
+                raise ValidationError({"detail": "is_read must be 'true' or 'false'."})
+            notifications = notifications.filter(is_read=is_read.lower() == 'true')
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"detail": "Invalid limit."})
+        limit = max(limit, 1)
+
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            created_at, pk = decode_keyset_cursor(cursor)
+            notifications = notifications.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        rows = list(notifications.order_by('-created_at', '-id')[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return Response({
+            "results": NotificationSerializer(rows, many=True).data,
+            "next_cursor": encode_keyset_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+            "has_more": has_more,
+            "unread_count": unread_counter.get_unread_count(request.tenant.schema_name, employee.id),
+        })
+
+
+class UnreadNotificationCountView(APIView):
+    """
+    Badge count from the Redis counter; Postgres is only hit when it is cold.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        count = unread_counter.get_unread_count(request.tenant.schema_name, request.user.employee.id)
+        return Response({"unread_count": count})
 
 
 class MarkNotificationReadView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        try:
-            notification = Notification.objects.get(id=pk, recipient=request.user.employee)
-        except Notification.DoesNotExist:
+        employee = request.user.employee
+        updated, unread_count = mark_read(request.tenant.schema_name, employee.id, [pk])
+        if not updated and not Notification.objects.filter(id=pk, recipient=employee).exists():
             return Response({"detail": "Notification not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        notification.is_read = True
-        notification.save()
+        return Response({"detail": "Notification marked as read.", "unread_count": unread_count})
+
+
+class MarkNotificationsReadView(APIView):
+    """
+    Bulk mark-read in one UPDATE: {"ids": [...]} for specific notifications or
+    {"all": true} for the whole inbox.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.data.get('all') is True:
+            notification_ids = None
+        else:
+            notification_ids = parse_notification_ids(request.data.get('ids'))
+            if notification_ids is None:
+                raise ValidationError({"detail": "Provide 'ids' (a non-empty list of ids) or 'all': true."})
 
-        return Response({"detail": "Notification marked as read."})
\ No newline at end of file
+        updated, unread_count = mark_read(request.tenant.schema_name, request.user.employee.id, notification_ids)
+        return Response({"updated": updated, "unread_count": unread_count})
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_management", "0019_alter_label_color_alter_label_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subtask",
+            name="order",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="order",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0020_subtask_order_task_order'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='developerassignmentauditlog',
+            name='assigned_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='subtaskassignmentaudit',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built concurrently so existing tables stay writable while the index builds.
+    atomic = False
+
+    dependencies = [
+        ('project_management', '0021_audit_timestamps_default_now'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='developerassignmentauditlog',
+            index=models.Index(fields=['assigned_at'], name='dev_assignment_audit_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='subtaskassignmentaudit',
+            index=models.Index(fields=['timestamp'], name='subtask_assign_audit_ts_idx'),
+        ),
+    ]
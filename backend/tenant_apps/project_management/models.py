@@ -1,5 +1,6 @@
 # project_management/models.py
 from django.db import models
+from django.utils import timezone
 from tenant_apps.employee.models import Employee
 from django.conf import settings
 from core.constants import TaskStatus, Priority, ProjectStatus
@@ -50,7 +51,13 @@ class DeveloperAssignmentAuditLog(models.Model):
     previous_manager = models.ForeignKey(Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
     new_manager = models.ForeignKey(Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
     assigned_by = models.ForeignKey(Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name="audit_logs_made")
-    assigned_at = models.DateTimeField(auto_now_add=True)
+    # Set explicitly so buffered audit writes keep the time of the change, not of the flush.
+    assigned_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_at'], name='dev_assignment_audit_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.developer} reassigned from {self.previous_manager or 'None'} ➜ {self.new_manager or 'None'}"
@@ -65,6 +72,7 @@ class Task(models.Model):
     created_by = models.ForeignKey(Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_tasks')
     due_date = models.DateField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=TaskStatus.choices, default=TaskStatus.TODO)
+    order = models.PositiveIntegerField(default=0)  # position within its status column
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -89,6 +97,7 @@ class Subtask(models.Model):
     assigned_to = models.ForeignKey(Employee, null=True, blank=True, on_delete=models.SET_NULL, related_name='subtasks')
     estimated_hours = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     status = models.CharField(max_length=20, choices=TaskStatus.choices)
+    order = models.PositiveIntegerField(default=0)  # position within its status column
     priority = models.CharField(max_length=20, choices=Priority.choices, default=Priority.MEDIUM)
     created_by = models.ForeignKey(Employee, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_subtasks')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -115,7 +124,12 @@ class SubtaskAssignmentAudit(models.Model):
     previous_assignee = models.ForeignKey(Employee, null=True, blank=True, on_delete=models.SET_NULL, related_name='previous_subtasks')
     new_assignee = models.ForeignKey(Employee, null=True, blank=True, on_delete=models.SET_NULL, related_name='new_subtasks')
     changed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp'], name='subtask_assign_audit_ts_idx'),
+        ]
 
 
 class SubtaskAuditLogRequest(models.Model):
@@ -139,7 +139,7 @@ class SubtaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Subtask
         fields = [
-            'id', 'task', 'title', 'description', 'due_date', 'status',
+            'id', 'task', 'title', 'description', 'due_date', 'status', 'order',
             'priority', 'assigned_to', 'assigned_to_id',
             'created_by', 'created_at', 'labels', 'comments',
             'project', 'estimated_hours', 
@@ -257,7 +257,7 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = [
             'id', 'project', 'title', 'description',
-            'due_date', 'status', 'priority', 'created_at',
+            'due_date', 'status', 'order', 'priority', 'created_at',
             'created_by', 'updated_at', 'subtasks', 'comments',
             'labels', 'label_ids'
         ]
@@ -322,6 +322,21 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class BulkStatusUpdateSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+    )
+    status = serializers.ChoiceField(choices=TaskStatus.choices)
+    order = serializers.IntegerField(min_value=0, required=False)
+
+    def validate_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("IDs must be unique.")
+        return value
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     members = serializers.SerializerMethodField()
     tasks = TaskSerializer(many=True, read_only=True, source='task_set')
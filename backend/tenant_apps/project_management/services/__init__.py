@@ -1,3 +1,5 @@
 from .audit_logging import log_pm_assignment_change
+from .audit_sink import record_audit_event
+from .status_transitions import bulk_update_status
 
-__all__ = ["log_pm_assignment_change"]
\ No newline at end of file
+__all__ = ["log_pm_assignment_change", "record_audit_event", "bulk_update_status"]
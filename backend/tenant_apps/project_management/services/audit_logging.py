@@ -1,12 +1,16 @@
-from tenant_apps.project_management.models import DeveloperAssignmentAuditLog
+from django.utils import timezone
+
+from tenant_apps.project_management.services.audit_sink import record_audit_event
 
 def log_pm_assignment_change(developer_id, previous_manager_id=None, new_manager_id=None, assigned_by=None):
     if previous_manager_id == new_manager_id:
         return
 
-    DeveloperAssignmentAuditLog.objects.create(
+    record_audit_event(
+        "pm_assignment",
         developer_id=developer_id,
         previous_manager_id=previous_manager_id,
         new_manager_id=new_manager_id,
-        assigned_by=assigned_by
+        assigned_by_id=assigned_by.id if assigned_by else None,
+        assigned_at=timezone.now(),
     )
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Audit Sink
+
+Buffers audit rows raised during a request and writes them with one bulk_create.
+
+AUDIT_SINK_DURABILITY picks the guarantee:
+    "sync"   - each row is inserted immediately, inside the caller's transaction.
+    "commit" - rows are buffered per transaction and bulk-inserted in-process right
+               after it commits. A crash between commit and flush loses the batch.
+    "async"  - rows are buffered per transaction and handed to a Celery worker after
+               commit (acks_late). If the broker is unreachable the batch is written
+               in-process instead, so nothing is dropped silently. This is the default.
+
+A failed flush is logged, never raised: by then the request's data has committed.
+"""
+
+import logging
+import threading
+import time
+
+from celery.signals import task_prerun
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connection, transaction
+from django.dispatch import receiver
+
+from core.utils.metrics import record_timing
+from tenant_apps.project_management.models import (
+    DeveloperAssignmentAuditLog,
+    SubtaskAssignmentAudit,
+)
+
+logger = logging.getLogger(__name__)
+
+AUDIT_MODELS = {
+    "subtask_assignment": SubtaskAssignmentAudit,
+    "pm_assignment": DeveloperAssignmentAuditLog,
+}
+
+_local = threading.local()
+
+
+def record_audit_event(kind, **fields):
+    """
+    Queues one audit row of `kind`. Fields use raw ids (e.g. `subtask_id`) so the
+    batch can be shipped to a worker.
+    """
+    mode = settings.AUDIT_SINK_DURABILITY
+
+    if mode == "sync":
+        write_audit_events([(kind, fields)])
+        return
+
+    if not connection.in_atomic_block:
+        flush_audit_events(mode, connection.schema_name, [(kind, fields)])
+        return
+
+    events = getattr(_local, "events", None)
+    if events is None:
+        events = _local.events = _open_batch(mode, connection.schema_name)
+    events.append((kind, fields))
+
+
+def _open_batch(mode, schema_name):
+    """
+    Starts the batch for the open transaction. Its flush is registered once and
+    owns the event list, so later events in the same transaction just append.
+    Record audit events outside nested atomic() blocks that may roll back: such
+    a rollback discards the flush along with the savepoint.
+    """
+    events = []
+
+    def flush():
+        if getattr(_local, "events", None) is events:
+            _local.events = None
+        flush_audit_events(mode, schema_name, events)
+
+    transaction.on_commit(flush)
+    return events
+
+
+@receiver(request_started)
+@task_prerun.connect
+def _discard_batch(**kwargs):
+    # A batch whose transaction rolled back never flushes; the next request or
+    # task must not append to it.
+    _local.events = None
+
+
+def flush_audit_events(mode, schema_name, events):
+    if mode == "async":
+        from tenant_apps.project_management.tasks.audit_tasks import write_audit_events_task
+        try:
+            write_audit_events_task.delay(schema_name, events)
+            return
+        except Exception:
+            logger.exception("Audit batch could not be queued; writing it in-process")
+
+    try:
+        write_audit_events(events)
+    except Exception:
+        logger.exception(f"Failed to write {len(events)} audit event(s) for {schema_name}")
+
+
+def write_audit_events(events):
+    """
+    Inserts a batch of (kind, fields) events with one bulk_create per model.
+    """
+    started = time.monotonic()
+
+    grouped = {}
+    for kind, fields in events:
+        grouped.setdefault(kind, []).append(AUDIT_MODELS[kind](**fields))
+
+    for kind, rows in grouped.items():
+        AUDIT_MODELS[kind].objects.bulk_create(rows)
+
+    record_timing("audit_sink.flush", time.monotonic() - started)
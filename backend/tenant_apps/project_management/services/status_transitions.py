@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models import Case, When, Value, Exists, OuterRef, PositiveIntegerField
+from django.utils import timezone
+from rest_framework.exceptions import PermissionDenied, ValidationError
+
+from core.constants import UserRoles, TaskStatus
+from tenant_apps.project_management.models import Task, Subtask, ProjectMember
+from tenant_apps.project_management.signals import status_bulk_changed
+
+
+def _pm_membership(project_ref, employee):
+    return Exists(
+        ProjectMember.objects.filter(
+            project_id=OuterRef(project_ref),
+            employee=employee,
+            role=UserRoles.PROJECT_MANAGER,
+            is_active=True,
+        )
+    )
+
+
+def _check_subtasks(user, ids):
+    """
+    Applies the SubtaskViewSet.partial_update rules to every subtask in one query.
+    """
+    employee = user.employee
+    rows = (
+        Subtask.objects.filter(id__in=ids)
+        .annotate(is_pm=_pm_membership('task__project_id', employee))
+        .values_list('id', 'assigned_to_id', 'task__project__is_active', 'task__status', 'is_pm')
+    )
+
+    found = set()
+    for subtask_id, assigned_to_id, project_active, task_status, is_pm in rows:
+        found.add(subtask_id)
+
+        if not project_active:
+            raise PermissionDenied("This project is inactive. You cannot modify its data.")
+        if task_status == TaskStatus.DONE:
+            raise ValidationError({"non_field_errors": ["Cannot modify subtasks of a completed task."]})
+
+        if user.is_tenant_admin():
+            continue
+        if user.role == UserRoles.PROJECT_MANAGER and is_pm:
+            continue
+        if user.role == UserRoles.DEVELOPER and assigned_to_id == employee.id:
+            continue
+        raise PermissionDenied("You do not have permission to access this subtask.")
+
+    return found
+
+
+def _check_tasks(user, ids):
+    """
+    Same as _check_subtasks, for tasks: tenant admins, or PMs of the task's project.
+    """
+    employee = user.employee
+    rows = (
+        Task.objects.filter(id__in=ids)
+        .annotate(is_pm=_pm_membership('project_id', employee))
+        .values_list('id', 'project__is_active', 'is_pm')
+    )
+
+    found = set()
+    for task_id, project_active, is_pm in rows:
+        found.add(task_id)
+
+        if not project_active:
+            raise PermissionDenied("This project is inactive. You cannot modify its data.")
+        if user.is_tenant_admin():
+            continue
+        if user.role == UserRoles.PROJECT_MANAGER and is_pm:
+            continue
+        raise PermissionDenied("You're not a manager of this task's project.")
+
+    return found
+
+
+def bulk_update_status(model, user, ids, status, order=None):
+    """
+    Moves many tasks or subtasks to `status` with a single UPDATE.
+
+    When `order` is given, cards are laid out from that position in the order of `ids`.
+    Sends one `status_bulk_changed` signal once the transaction commits.
+    """
+    checker = _check_subtasks if model is Subtask else _check_tasks
+    found = checker(user, ids)
+
+    missing = set(ids) - found
+    if missing:
+        raise ValidationError({"ids": [f"Invalid IDs: {sorted(missing)}"]})
+
+    fields = {'status': status}
+    if order is not None:
+        fields['order'] = Case(
+            *[When(id=obj_id, then=Value(order + position)) for position, obj_id in enumerate(ids)],
+            output_field=PositiveIntegerField(),
+        )
+    if model is Task:
+        fields['updated_at'] = timezone.now()
+
+    with transaction.atomic():
+        updated = model.objects.filter(id__in=ids).update(**fields)
+        transaction.on_commit(lambda: status_bulk_changed.send(
+            sender=model,
+            ids=list(ids),
+            status=status,
+            order=order,
+            changed_by=user,
+        ))
+
+    return updated
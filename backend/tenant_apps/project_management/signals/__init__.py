@@ -1 +1,6 @@
-from . import add_member_to_chatroom, create_project_chatroom, remove_member_from_chatroom
\ No newline at end of file
+from django.dispatch import Signal
+
+# Sent once per bulk status transition with `ids`, `status`, `order` and `changed_by`.
+status_bulk_changed = Signal()
+
+from . import add_member_to_chatroom, create_project_chatroom, notify_status_change, remove_member_from_chatroom
@@ -0,0 +1,54 @@
+from collections import Counter
+
+from django.db import connection
+from django.dispatch import receiver
+
+from core.constants import TaskStatus, UserRoles
+from tenant_apps.project_management.models import Project, ProjectMember, Subtask, Task
+from tenant_apps.project_management.signals import status_bulk_changed
+
+
+@receiver(status_bulk_changed)
+def notify_status_change(sender, ids, status, changed_by, **kwargs):
+    """
+    Turns one bulk status change into one notification per person and project:
+    subtask assignees for subtasks, the project's managers for tasks. The
+    person who made the change is skipped. Everything goes out as a single
+    Celery message.
+    """
+    from tenant_apps.notifications.tasks.notification_tasks import send_notifications_task
+
+    changed_by_id = getattr(getattr(changed_by, 'employee', None), 'id', None)
+    moved = Counter()
+
+    if sender is Subtask:
+        noun = "subtask"
+        rows = Subtask.objects.filter(id__in=ids, assigned_to__isnull=False).values_list(
+            'assigned_to_id', 'task__project_id'
+        )
+        for employee_id, project_id in rows:
+            moved[(employee_id, project_id)] += 1
+    else:
+        noun = "task"
+        per_project = Counter(Task.objects.filter(id__in=ids).values_list('project_id', flat=True))
+        managers = ProjectMember.objects.filter(
+            project_id__in=per_project, role=UserRoles.PROJECT_MANAGER, is_active=True
+        ).values_list('employee_id', 'project_id')
+        for employee_id, project_id in managers:
+            moved[(employee_id, project_id)] += per_project[project_id]
+
+    moved = {key: count for key, count in moved.items() if key[0] != changed_by_id}
+    if not moved:
+        return
+
+    names = dict(Project.objects.filter(id__in={project_id for _, project_id in moved}).values_list('id', 'name'))
+    label = TaskStatus(status).label
+    send_notifications_task.delay(connection.schema_name, [
+        {
+            "recipient_id": employee_id,
+            "message": f"{count} {noun}{'s' if count > 1 else ''} moved to '{label}' in project: '{names[project_id]}'.",
+            "url": f"/projects/{project_id}/",
+            "target": f"project:{project_id}",
+        }
+        for (employee_id, project_id), count in moved.items()
+    ])
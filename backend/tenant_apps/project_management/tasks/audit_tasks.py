@@ -0,0 +1,13 @@
+from celery import shared_task
+from django_tenants.utils import schema_context
+
+from tenant_apps.project_management.services.audit_sink import write_audit_events
+
+
+@shared_task(acks_late=True)
+def write_audit_events_task(schema_name, events):
+    """
+    Writes an audit batch queued by the audit sink in "async" mode.
+    """
+    with schema_context(schema_name):
+        write_audit_events([(kind, fields) for kind, fields in events])
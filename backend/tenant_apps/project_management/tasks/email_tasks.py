@@ -1,11 +1,10 @@
 from celery import shared_task
-from django.core.mail import send_mail
 from django.conf import settings
 from django_tenants.utils import schema_context
 from shared_apps.tenants.models import Domain
 from tenant_apps.employee.models import Employee
-from django.template.loader import render_to_string
-from premailer import transform
+from shared_apps.mailer.dispatch import send_email
+from shared_apps.mailer.rendering import render_email
 
 
 @shared_task
@@ -22,13 +21,12 @@ def send_pm_blocking_subtasks_email(schema_name, pm_id, developer_name, project_
 
         subject = "Action Required: Unassignment Blocked by Active Subtasks"
 
-        html_message = render_to_string("emails/project_management/pm_blocking_subtasks_email.html", {
+        html_message = render_email("emails/project_management/pm_blocking_subtasks_email.html", {
             'pm_name': pm.full_name,
             'developer_name': developer_name,
             'project_names': project_names,
             'tenant_name': tenant_name,
         })
-        html_message = transform(html_message)
 
         plain_message = (
             f"Hello {pm.full_name},\n\n"
@@ -39,11 +37,9 @@ def send_pm_blocking_subtasks_email(schema_name, pm_id, developer_name, project_
             f"Thank you,\nProject Management System"
         )
 
-        send_mail(
+        send_email(
             subject=subject,
             message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[pm.user.email],
             html_message=html_message,
-            fail_silently=False,
         )
\ No newline at end of file
@@ -32,8 +32,7 @@ class ProjectMemberViewSet(viewsets.ModelViewSet):
         return ProjectMember.objects.filter(is_active=True)
 
     def perform_create(self, serializer):
-        obj = serializer.save(created_by=self.request.user.employee)
-        ensure_project_is_active(obj.project)
+        ensure_project_is_active(serializer.validated_data['project'])
 
         pm = self.request.user.employee
         employee = serializer.validated_data['employee']
@@ -9,13 +9,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.core.exceptions import ObjectDoesNotExist
 
+from core.constants import NotificationKind
+
 from tenant_apps.employee.models import Employee
-from tenant_apps.notifications.tasks.notification_tasks import send_notification_task
+from tenant_apps.notifications.mixins import SideEffectsMixin
 from tenant_apps.project_management.models import Subtask
 from tenant_apps.project_management.tasks.email_tasks import send_pm_blocking_subtasks_email
 
 
-class NotifyPMView(APIView):
+class NotifyPMView(SideEffectsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -50,15 +52,17 @@ class NotifyPMView(APIView):
                 + ". Please resolve them to allow unassignment."
             )
 
-            send_notification_task.delay(
-                schema_name=pm.tenant.schema_name,
-                recipient_id=pm.id,
-                message=message,
-                url="/"
+            self.side_effects.notify(
+                pm.id,
+                message,
+                url="/",
+                kind=NotificationKind.BLOCKING_SUBTASKS,
+                target=f"developer:{developer.id}",
             )
 
-            send_pm_blocking_subtasks_email.delay(
-                pm.tenant.schema_name,
+            self.side_effects.email(
+                send_pm_blocking_subtasks_email,
+                request.tenant.schema_name,
                 pm.id,
                 developer.full_name,
                 list(project_names)
@@ -7,24 +7,25 @@ This module includes viewsets for managing tasks, subtasks, and task-related met
 import logging
 from django.core.exceptions import ObjectDoesNotExist
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 
-from tenant_apps.employee.models import Employee
-from tenant_apps.notifications.tasks.notification_tasks import send_notification_task
+from tenant_apps.notifications.mixins import SideEffectsMixin
 from tenant_apps.project_management.models import (
     Project, Task, Subtask,
-    SubtaskAssignmentAudit, Label,
+    Label,
     ProjectMember
 )
 from tenant_apps.project_management.tasks.email_tasks import send_pm_blocking_subtasks_email
+from tenant_apps.project_management.services import bulk_update_status, record_audit_event
 
-from core.constants import UserRoles
+from core.constants import NotificationKind, UserRoles
 from core.guards.project_guards import (
     ensure_project_is_active,
     ensure_active_via_task,
@@ -40,6 +41,7 @@ from tenant_apps.project_management.serializers import (
     SubtaskSerializer,
     LabelSerializer,
     SubtaskAssignmentAuditSerializer,
+    BulkStatusUpdateSerializer,
 )
 
 logger = logging.getLogger(__name__)
@@ -61,17 +63,18 @@ class TaskViewSet(viewsets.ModelViewSet):
         return qs
 
     def perform_create(self, serializer):
-        obj = serializer.save(created_by=self.request.user.employee)
-        ensure_project_is_active(obj.project)
+        project = serializer.validated_data['project']
+        ensure_project_is_active(project)
 
         user = self.request.user
         employee = user.employee
-        task = serializer.save(created_by=employee)
 
-        if employee.user.role == UserRoles.PROJECT_MANAGER:
-            if not ProjectMember.objects.filter(is_active=True, project=task.project, employee=employee).exists():
+        if user.role == UserRoles.PROJECT_MANAGER:
+            if not ProjectMember.objects.filter(is_active=True, project=project, employee=employee).exists():
                 raise PermissionDenied("You're not a member of this project.")
 
+        serializer.save(created_by=employee)
+
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
         ensure_project_is_active(instance.project)
@@ -82,8 +85,25 @@ class TaskViewSet(viewsets.ModelViewSet):
         ensure_active_via_task(task)
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        serializer = BulkStatusUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        updated = bulk_update_status(
+            Task, request.user, data['ids'], data['status'], data.get('order')
+        )
+
+        return Response({
+            "detail": "Status updated.",
+            "ids": data['ids'],
+            "status": data['status'],
+            "updated": updated,
+        }, status=status.HTTP_200_OK)
 
-class SubtaskViewSet(viewsets.ModelViewSet):
+
+class SubtaskViewSet(SideEffectsMixin, viewsets.ModelViewSet):
     queryset = Subtask.objects.all()
     serializer_class = SubtaskSerializer
     permission_classes = [IsAuthenticated]
@@ -137,25 +157,23 @@ class SubtaskViewSet(viewsets.ModelViewSet):
         logger.warning(f"Access denied for user {user} on subtask {obj.id}")
         raise PermissionDenied("You do not have permission to access this subtask.")
 
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        subtask = Subtask.objects.get(id=response.data['id'])
-    
+    def perform_create(self, serializer):
+        subtask = serializer.save()
+
         # Notify if subtask is assigned on creation
-        if subtask.assigned_to:
-            send_notification_task.delay(
-                schema_name=subtask.schema_name,
-                recipient_id=subtask.assigned_to.id,
-                message=f"You have been assigned a new subtask: {subtask.title}",
-                url=f"/subtasks/{subtask.id}/"
+        if subtask.assigned_to_id:
+            self.side_effects.notify(
+                subtask.assigned_to_id,
+                f"You have been assigned a new subtask: {subtask.title}",
+                url=f"/subtasks/{subtask.id}/",
+                kind=NotificationKind.SUBTASK_ASSIGNED,
+                target=f"project:{subtask.task.project_id}",
             )
-        return response
 
     def partial_update(self, request, *args, **kwargs):
-        instance = self.get_object()
-        ensure_project_is_active(instance.task.project)
-
         subtask = self.get_object()
+        ensure_project_is_active(subtask.task.project)
+
         user = request.user
         employee = user.employee
         previous_assignee = subtask.assigned_to
@@ -170,62 +188,77 @@ class SubtaskViewSet(viewsets.ModelViewSet):
                 raise PermissionDenied("You can only update status or due date.")
     
         # Perform update
-        response = super().partial_update(request, *args, **kwargs)
+        serializer = self.get_serializer(subtask, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        new_assignee = serializer.instance.assigned_to
     
         # Log reassignment only if 'assigned_to' changed
-        new_assignee_id = request.data.get('assigned_to_id')
-        if 'assigned_to_id' in request.data:
-            logger.warning("🔔 Reassignment logic triggered")
-            new_assignee = None
-            if new_assignee_id:
-                try:
-                    new_assignee = Employee.objects.get(id=new_assignee_id)
-                except Employee.DoesNotExist:
-                    pass
-    
-            if previous_assignee != new_assignee:
-                project_title = subtask.task.project.name
-                task_title = subtask.task.title
-                subtask_title = subtask.title
-
-                SubtaskAssignmentAudit.objects.create(
-                    subtask=subtask,
-                    previous_assignee=previous_assignee,
-                    new_assignee=new_assignee,
-                    changed_by=request.user
+        if 'assigned_to_id' in request.data and previous_assignee != new_assignee:
+            logger.info(f"Subtask {subtask.id} reassigned by {user}")
+            project_title = subtask.task.project.name
+            project_target = f"project:{subtask.task.project_id}"
+            task_title = subtask.task.title
+            subtask_title = subtask.title
+
+            record_audit_event(
+                "subtask_assignment",
+                subtask_id=subtask.id,
+                previous_assignee_id=previous_assignee.id if previous_assignee else None,
+                new_assignee_id=new_assignee.id if new_assignee else None,
+                changed_by_id=request.user.id,
+                timestamp=timezone.now(),
+            )
+            
+            # Notify previous assignee (if any)
+            if previous_assignee:
+                self.side_effects.notify(
+                    previous_assignee.id,
+                    (
+                        f"You have been unassigned from subtask: '{subtask_title}' "
+                        f"in task: '{task_title}' under project: '{project_title}'."
+                    ),
+                    url=f"/subtasks/{subtask.id}/",
+                    kind=NotificationKind.SUBTASK_UNASSIGNED,
+                    target=project_target,
+                )
+
+            # Notify new assignee (if any)
+            if new_assignee:
+                self.side_effects.notify(
+                    new_assignee.id,
+                    (
+                        f"You have been assigned to subtask: '{subtask_title}' "
+                        f"in task: '{task_title}' under project: '{project_title}'."
+                    ),
+                    url=f"/subtasks/{subtask.id}/",
+                    kind=NotificationKind.SUBTASK_ASSIGNED,
+                    target=project_target,
                 )
-                
-                # Notify previous assignee (if any)
-                if previous_assignee:
-                    send_notification_task.delay(
-                        schema_name=subtask.schema_name,
-                        recipient_id=previous_assignee.id,
-                        message=(
-                            f"You have been unassigned from subtask: '{subtask_title}' "
-                            f"in task: '{task_title}' under project: '{project_title}'."
-                        ),
-                        url=f"/subtasks/{subtask.id}/"
-                    )
-
-
-                # Notify new assignee (if any)
-                if new_assignee:
-                    send_notification_task.delay(
-                        schema_name=subtask.schema_name,
-                        recipient_id=new_assignee.id,
-                        message=(
-                            f"You have been assigned to subtask: '{subtask_title}' "
-                            f"in task: '{task_title}' under project: '{project_title}'."
-                        ),
-                        url=f"/subtasks/{subtask.id}/"
-                    )
-        return response
+        return Response(serializer.data)
 
     def destroy(self, request, *args, **kwargs):
         subtask = self.get_object()
         ensure_active_via_subtask(subtask)
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        serializer = BulkStatusUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        updated = bulk_update_status(
+            Subtask, request.user, data['ids'], data['status'], data.get('order')
+        )
+
+        return Response({
+            "detail": "Status updated.",
+            "ids": data['ids'],
+            "status": data['status'],
+            "updated": updated,
+        }, status=status.HTTP_200_OK)
+
 
 class LabelViewSet(viewsets.ModelViewSet):
     queryset = Label.objects.all()
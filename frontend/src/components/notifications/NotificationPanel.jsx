@@ -2,8 +2,11 @@
 import { useState } from "react";
 import { FaBell } from "react-icons/fa";
 import { useDispatch, useSelector } from "react-redux";
-import { markNotificationAsRead } from "../../domains/notifications/features/notificationSlice";
-import { socketRef } from "../../domains/notifications/NotificationListener";
+import {
+  markAllNotificationsAsRead,
+  markNotificationAsRead,
+} from "../../domains/notifications/features/notificationSlice";
+import { send } from "../../utils/multiplexSocket";
 
 const NotificationPanel = () => {
   const [expanded, setExpanded] = useState(false);
@@ -17,23 +20,23 @@ const NotificationPanel = () => {
     dispatch(markNotificationAsRead(id));
 
     // Send to WebSocket to persist in DB
-    if (socketRef.current?.readyState === WebSocket.OPEN) {
-      socketRef.current.send(
-        JSON.stringify({
-          action: "mark_read",
-          notification_id: id,
-        })
-      );
-    } else {
+    if (!send("notifications", { action: "mark_read", notification_id: id })) {
       console.warn("⚠️ WebSocket not open. Cannot mark notification as read in DB.");
     }
   };
 
+  const handleMarkAllRead = () => {
+    dispatch(markAllNotificationsAsRead());
+    if (!send("notifications", { action: "mark_all_read" })) {
+      console.warn("⚠️ WebSocket not open. Cannot mark notifications as read in DB.");
+    }
+  };
+
   const sortedNotifications = [...notifications].sort(
     (a, b) => new Date(b.created_at) - new Date(a.created_at)
   );
 
-  const unreadCount = sortedNotifications.filter((n) => !n.is_read).length;
+  const unreadCount = useSelector((state) => state.notifications.unreadCount);
 
   return (
     <div className="relative inline-block text-left z-50">
@@ -52,7 +55,17 @@ const NotificationPanel = () => {
 
       {expanded && (
         <div className="absolute right-0 mt-2 w-80 bg-white border rounded shadow-lg p-4 z-50">
-          <h4 className="text-md font-semibold mb-3">Notifications</h4>
+          <div className="flex items-center justify-between mb-3">
+            <h4 className="text-md font-semibold">Notifications</h4>
+            {unreadCount > 0 && (
+              <button
+                onClick={handleMarkAllRead}
+                className="text-xs text-blue-600 hover:underline focus:outline-none"
+              >
+                Mark all read
+              </button>
+            )}
+          </div>
 
           {notifications.length === 0 ? (
             <p className="text-sm text-gray-400">No notifications yet.</p>
@@ -66,7 +79,12 @@ const NotificationPanel = () => {
                     n.is_read ? "bg-gray-100" : "bg-blue-50 border-blue-200"
                   }`}
                 >
-                  <p className="text-sm text-gray-800">{n.message}</p>
+                  <p className="text-sm text-gray-800">
+                    {n.message}
+                    {n.count > 1 && (
+                      <span className="ml-2 text-xs text-gray-500">×{n.count}</span>
+                    )}
+                  </p>
                   <p className="text-xs text-gray-500 mt-1">
                     {new Date(n.created_at).toLocaleString()}
                   </p>
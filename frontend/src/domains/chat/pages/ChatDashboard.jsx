@@ -5,7 +5,7 @@ import MessageList from "../components/MessageList";
 import MessageInput from "../components/MessageInput";
 import apiClient from "../../../api/apiClient";
 import { useSelector } from "react-redux";
-import { createWebSocket } from "../../../utils/wsClient";
+import { subscribe, send, isOpen } from "../../../utils/multiplexSocket";
 import UserListModal from "../components/UserListModal";
 
 const ChatDashboard = () => {
@@ -16,9 +16,8 @@ const ChatDashboard = () => {
   const [showUserList, setShowUserList] = useState(false);
   const [loadingRooms, setLoadingRooms] = useState(true);
   const [loadingMessages, setLoadingMessages] = useState(false);
-  const socketRef = useRef(null);
+  const unsubscribeRef = useRef(null);
   const prevRoomIdRef = useRef(null);
-  const shouldReconnect = useRef(true);
 
   const [unreadRooms, setUnreadRooms] = useState({}); // { roomId: true } if room has unread messages
 
@@ -33,6 +32,11 @@ const ChatDashboard = () => {
       setLoadingRooms(true);
       const res = await apiClient.get("/api/chat-rooms/");
       setChatRooms(res.data || []);
+      setUnreadRooms(
+        Object.fromEntries(
+          (res.data || []).filter((room) => room.unread_count > 0).map((room) => [room.id, true])
+        )
+      );
       if (res.data.length > 0) setActiveRoom(res.data[0]);
     } finally {
       setLoadingRooms(false);
@@ -43,7 +47,7 @@ const ChatDashboard = () => {
     try {
       setLoadingMessages(true);
       const res = await apiClient.get(`/api/chat-rooms/${roomId}/messages/`);
-      const normalized = res.data.map((msg) => ({
+      const normalized = res.data.results.map((msg) => ({
         ...msg,
         sender: {
           id: msg.sender,
@@ -59,20 +63,16 @@ const ChatDashboard = () => {
   };
 
   const connectWebSocket = (roomId) => {
-    if (socketRef.current) {
-      shouldReconnect.current = false;
-      socketRef.current.close();
-    }
+    unsubscribeRef.current?.();
 
-    shouldReconnect.current = true;
-    socketRef.current = createWebSocket(`/ws/chat/${roomId}/`);
-
-    socketRef.current.onopen = () => {
-      console.log("WebSocket connected");
-    };
+    unsubscribeRef.current = subscribe(`chat:${roomId}`, (frame) => {
+      if (frame.error) {
+        console.warn("Chat stream error:", frame.error);
+        return;
+      }
+      if (!frame.payload) return;
 
-    socketRef.current.onmessage = (e) => {
-      const data = JSON.parse(e.data);
+      const data = frame.payload;
     
       if (data.type === "seen") {
         console.log("Message seen:", data.message_id);
@@ -133,21 +133,7 @@ const ChatDashboard = () => {
       if (data.room_id && data.room_id !== activeRoom?.id) {
         setUnreadRooms((prev) => ({ ...prev, [data.room_id]: true }));
       }
-    };
-
-
-    socketRef.current.onclose = (e) => {
-      console.log("WebSocket closed. Code:", e.code, "Reason:", e.reason);
-
-      if (shouldReconnect.current && e.code !== 1000) {
-        console.log("Reconnecting in 3 seconds...");
-        setTimeout(() => connectWebSocket(roomId), 3000);
-      }
-    };
-
-    socketRef.current.onerror = (err) => {
-      console.error("WebSocket error", err);
-    };
+    });
   };
 
   const handleRoomSelect = (room) => {
@@ -161,7 +147,7 @@ const ChatDashboard = () => {
   };
 
   const handleSendMessage = (text) => {
-    if (!activeRoom || !socketRef.current || socketRef.current.readyState !== WebSocket.OPEN) {
+    if (!activeRoom || !isOpen()) {
       alert("WebSocket not connected.");
       return;
     }
@@ -178,7 +164,7 @@ const ChatDashboard = () => {
     setMessages((prev) => [...prev, optimisticMessage]);
     optimisticMessagesRef.current[tempId] = true;
 
-    socketRef.current.send(JSON.stringify({ message: text, temp_id: tempId }));
+    send(`chat:${activeRoom.id}`, { message: text, temp_id: tempId });
   };
 
   useEffect(() => {
@@ -192,21 +178,21 @@ const ChatDashboard = () => {
     }
 
     return () => {
-      if (socketRef.current) {
-        console.log("Cleaning up WebSocket...");
-        shouldReconnect.current = false;
-        socketRef.current.close();
+      if (unsubscribeRef.current) {
+        console.log("Cleaning up chat subscription...");
+        unsubscribeRef.current();
+        unsubscribeRef.current = null;
       }
     };
   }, [activeRoom?.id]);
 
   useEffect(() => {
-    if (!socketRef.current || socketRef.current.readyState !== WebSocket.OPEN) return;
+    if (!activeRoom?.id || !isOpen()) return;
     if (messages.length === 0) return;
 
     const lastMsg = messages[messages.length - 1];
     if (lastMsg?.sender?.id !== currentUser.id) {
-      socketRef.current.send(JSON.stringify({ type: "seen", message_id: lastMsg.id }));
+      send(`chat:${activeRoom.id}`, { type: "seen", message_id: lastMsg.id });
     }
   }, [messages]);
 
@@ -1,36 +1,42 @@
 // src/components/notifications/NotificationListener.jsx
-import { useEffect, useRef } from "react";
-import { useDispatch, useSelector } from "react-redux";
-import { addNotification } from "../../domains/notifications/features/notificationSlice";
-import { createWebSocket } from "../../utils/wsClient";
-
-export const socketRef = { current: null }; // Export for global access
+import { useEffect } from "react";
+import { useDispatch, useSelector, useStore } from "react-redux";
+import {
+  addNotification,
+  notificationsMarkedRead,
+  replayNotifications,
+} from "../../domains/notifications/features/notificationSlice";
+import { subscribe } from "../../utils/multiplexSocket";
 
 const NotificationListener = () => {
   const user = useSelector((state) => state.auth.user);
   const dispatch = useDispatch();
+  const store = useStore();
 
   useEffect(() => {
     if (!user?.id) return;
 
-    const socket = createWebSocket("/ws/notifications/");
-    socketRef.current = socket;
-
-    socket.onopen = () => console.log("🔔 Notification WebSocket connected");
-
-    socket.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      console.log("📥 Notification received:", data);
-      dispatch(addNotification(data));
-    };
-
-    socket.onerror = (err) => console.error("❌ Notification socket error", err);
-    socket.onclose = (e) => console.warn("🔕 Notification WebSocket closed", e.code);
-
-    return () => socket.close();
+    return subscribe(
+      "notifications",
+      (frame) => {
+        if (!frame.payload) return;
+        if (frame.payload.type === "replay") {
+          dispatch(replayNotifications(frame.payload));
+          return;
+        }
+        if (frame.payload.type === "marked_read") {
+          dispatch(notificationsMarkedRead(frame.payload));
+          return;
+        }
+        console.log("📥 Notification received:", frame.payload);
+        dispatch(addNotification(frame.payload));
+      },
+      // Read at every (re)subscribe so a reconnect only replays what was missed.
+      () => ({ since: store.getState().notifications.lastId })
+    );
   }, [user?.id]);
 
   return null;
 };
 
-export default NotificationListener;
\ No newline at end of file
+export default NotificationListener;
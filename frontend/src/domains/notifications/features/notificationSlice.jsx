@@ -3,6 +3,14 @@ import { createSlice } from "@reduxjs/toolkit";
 
 const initialState = {
   messages: [],
+  unreadCount: 0,
+  lastId: null, // newest server id held; sent as `since` when the socket reconnects
+};
+
+const trackLastId = (state, id) => {
+  if (typeof id === "number" && (state.lastId === null || id > state.lastId)) {
+    state.lastId = id;
+  }
 };
 
 const notificationSlice = createSlice({
@@ -26,26 +34,65 @@ const notificationSlice = createSlice({
 
       if (!exists) {
         state.messages.unshift(newNotification);
+        if (!newNotification.is_read) state.unreadCount += 1;
+      }
+      trackLastId(state, newNotification.id);
+    },
+
+    replayNotifications: (state, action) => {
+      const { notifications = [], unread_count = 0, truncated = false } = action.payload;
+
+      if (truncated) {
+        // Too far behind to merge; start over from the server's newest page.
+        state.messages = [];
       }
+      const known = new Set(state.messages.map((n) => n.id));
+      const missing = notifications.filter((n) => !known.has(n.id));
+      state.messages = [...missing, ...state.messages];
+      state.unreadCount = unread_count;
+      notifications.forEach((n) => trackLastId(state, n.id));
     },
 
     markNotificationAsRead: (state, action) => {
       const id = action.payload;
       const target = state.messages.find((n) => n.id === id);
-      if (target) {
+      if (target && !target.is_read) {
         target.is_read = true;
+        state.unreadCount = Math.max(state.unreadCount - 1, 0);
       }
     },
 
+    markAllNotificationsAsRead: (state) => {
+      state.messages.forEach((n) => {
+        n.is_read = true;
+      });
+      state.unreadCount = 0;
+    },
+
+    // Server acknowledgement of a mark-read; its count is authoritative.
+    notificationsMarkedRead: (state, action) => {
+      const { notification_ids: ids = null, unread_count = 0 } = action.payload;
+      const marked = ids === null ? null : new Set(ids);
+      state.messages.forEach((n) => {
+        if (marked === null || marked.has(n.id)) n.is_read = true;
+      });
+      state.unreadCount = unread_count;
+    },
+
     clearNotifications: (state) => {
       state.messages = [];
+      state.unreadCount = 0;
+      state.lastId = null;
     },
   },
 });
 
 export const {
   addNotification,
+  replayNotifications,
   markNotificationAsRead,
+  markAllNotificationsAsRead,
+  notificationsMarkedRead,
   clearNotifications,
 } = notificationSlice.actions;
 
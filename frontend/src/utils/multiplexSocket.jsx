@@ -0,0 +1,79 @@
+import { createWebSocket } from "./wsClient";
+
+// One socket per tab for notifications and every open chat room. Each is a
+// logical stream ("notifications", "chat:<roomId>") on /ws/multiplex/.
+const handlers = new Map(); // stream -> Set of callbacks
+const subscribeParams = new Map(); // stream -> () => extra subscribe fields
+let socket = null;
+let reconnectTimer = null;
+
+function sendFrame(frame) {
+  if (socket?.readyState !== WebSocket.OPEN) return false;
+  socket.send(JSON.stringify(frame));
+  return true;
+}
+
+function connect() {
+  reconnectTimer = null;
+  socket = createWebSocket("/ws/multiplex/");
+
+  socket.onopen = () => {
+    console.log("🔌 Multiplexed WebSocket connected");
+    handlers.forEach((_, stream) => sendSubscribe(stream));
+  };
+
+  socket.onmessage = (e) => {
+    const frame = JSON.parse(e.data);
+    handlers.get(frame.stream)?.forEach((callback) => callback(frame));
+  };
+
+  socket.onclose = (e) => {
+    console.warn("🔌 Multiplexed WebSocket closed", e.code);
+    socket = null;
+    if (handlers.size > 0 && e.code !== 1000 && e.code !== 4401) {
+      reconnectTimer = setTimeout(connect, 3000);
+    }
+  };
+
+  socket.onerror = (err) => console.error("❌ Multiplexed WebSocket error", err);
+}
+
+function sendSubscribe(stream) {
+  const params = subscribeParams.get(stream)?.() || {};
+  sendFrame({ action: "subscribe", stream, ...params });
+}
+
+export function subscribe(stream, callback, params) {
+  if (params) subscribeParams.set(stream, params);
+  if (!handlers.has(stream)) {
+    handlers.set(stream, new Set());
+    sendSubscribe(stream);
+  }
+  handlers.get(stream).add(callback);
+
+  if (!socket && !reconnectTimer) connect();
+
+  return () => {
+    const callbacks = handlers.get(stream);
+    if (!callbacks) return;
+    callbacks.delete(callback);
+    if (callbacks.size > 0) return;
+
+    handlers.delete(stream);
+    subscribeParams.delete(stream);
+    sendFrame({ action: "unsubscribe", stream });
+    if (handlers.size === 0) {
+      clearTimeout(reconnectTimer);
+      reconnectTimer = null;
+      socket?.close(1000);
+    }
+  };
+}
+
+export function send(stream, payload) {
+  return sendFrame({ stream, payload });
+}
+
+export function isOpen() {
+  return socket?.readyState === WebSocket.OPEN;
+}